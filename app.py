@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.scheduler.daily_scheduler import DailyScheduler
 from src.utils.market_utils import KST, is_trading_day
+from src.utils.trading_calendar import get_trading_calendar
 
 app = Flask(__name__)
 CORS(app)
@@ -174,13 +175,11 @@ def download_report(date, format):
 def get_trading_days():
     """최근 30일간의 거래일 목록"""
     try:
-        trading_days = []
         today = datetime.now(KST)
-        
-        for i in range(30):
-            date = today - timedelta(days=i)
-            if is_trading_day(date):
-                trading_days.append(date.strftime('%Y-%m-%d'))
+        trading_days = [
+            day.strftime('%Y-%m-%d')
+            for day in get_trading_calendar().between(today - timedelta(days=29), today)[::-1]
+        ]
         
         return jsonify({
             'success': True,
@@ -7,6 +7,7 @@ Korean Stock Daily Report Automation System
     python main.py                    # 스케줄러 시작 (자동 실행)
     python main.py manual             # 수동으로 즉시 실행
     python main.py test               # 시스템 테스트
+    python main.py backfill --from 2025-07-01 --to 2025-07-31  # 기간 보고서 일괄 생성
 """
 
 import sys
@@ -21,6 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.scheduler.daily_scheduler import DailyScheduler
 from src.utils.email_sender import EmailSender
 from src.utils.market_utils import KST
+from src.data_source.data_source import create_data_source, set_default_source
 
 # 로깅 설정
 logging.basicConfig(
@@ -73,6 +75,21 @@ def run_manual(target_date=None):
         logger.error(f"수동 실행 오류: {e}")
         sys.exit(1)
 
+def run_backfill(from_date, to_date, workers=None):
+    """기간 보고서 일괄 생성"""
+    try:
+        create_directories()
+        logger.info(f"=== {from_date} ~ {to_date} 기간 보고서 일괄 생성 시작 ===")
+        
+        scheduler = DailyScheduler()
+        html_paths = scheduler.backfill(from_date, to_date, workers=workers)
+        
+        logger.info(f"기간 보고서 일괄 생성 완료: {len(html_paths)}개")
+        
+    except Exception as e:
+        logger.error(f"백필 실행 오류: {e}")
+        sys.exit(1)
+
 def run_test():
     """시스템 테스트"""
     try:
@@ -158,6 +175,7 @@ def main():
   python main.py              # 스케줄러 시작 (평일 16:00 자동 실행)
   python main.py manual       # 지금 즉시 보고서 생성
   python main.py test         # 시스템 테스트 실행
+  python main.py backfill --from 2025-07-01 --to 2025-07-31  # 기간 보고서 일괄 생성
         """
     )
     
@@ -165,7 +183,7 @@ def main():
         'mode',
         nargs='?',
         default='scheduler',
-        choices=['scheduler', 'manual', 'test'],
+        choices=['scheduler', 'manual', 'test', 'backfill'],
         help='실행 모드 선택 (기본값: scheduler)'
     )
     
@@ -175,8 +193,62 @@ def main():
         help='특정 날짜의 데이터를 가져옴 (형식: YYYY-MM-DD)'
     )
     
+    parser.add_argument(
+        '--from',
+        dest='from_date',
+        type=str,
+        help='백필 시작 날짜 (형식: YYYY-MM-DD)'
+    )
+    
+    parser.add_argument(
+        '--to',
+        dest='to_date',
+        type=str,
+        help='백필 종료 날짜 (형식: YYYY-MM-DD)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='백필 보고서 렌더링 프로세스 수'
+    )
+    
+    parser.add_argument(
+        '--record',
+        type=str,
+        metavar='PATH',
+        help='외부 데이터 응답을 픽스처 파일로 기록'
+    )
+    
+    parser.add_argument(
+        '--replay',
+        type=str,
+        metavar='PATH',
+        help='기록된 픽스처로 네트워크 없이 실행'
+    )
+    
+    parser.add_argument(
+        '--replay-latency',
+        type=float,
+        default=0.0,
+        help='재생 시 호출당 지연 시간(초)'
+    )
+    
     args = parser.parse_args()
     
+    if args.mode == 'backfill' and not (args.from_date and args.to_date):
+        parser.error('backfill 모드에는 --from 과 --to 가 필요합니다.')
+    
+    if args.record and args.replay:
+        parser.error('--record 와 --replay 는 함께 사용할 수 없습니다.')
+    
+    # 모든 수집기가 사용할 데이터 소스 설정 (실시간/기록/재생)
+    set_default_source(create_data_source(
+        record_path=args.record,
+        replay_path=args.replay,
+        replay_latency=args.replay_latency
+    ))
+    
     print(f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║          한국 주식시장 일일 분석 보고서 자동화 시스템          ║
@@ -193,6 +265,8 @@ def main():
         run_manual(target_date=args.date)
     elif args.mode == 'test':
         run_test()
+    elif args.mode == 'backfill':
+        run_backfill(args.from_date, args.to_date, workers=args.workers)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
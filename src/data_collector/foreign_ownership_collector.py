@@ -0,0 +1,128 @@
+"""
+외국인 보유 / 한도 소진율 수집
+전종목 외국인 보유수량, 지분율, 한도소진률을 시장별 벌크 조회 한 번으로 받아
+거래일별로 저장소에 기록한다. 일간/N일 변화량은 기준일 프레임끼리 티커 단위로 정렬해
+컬럼 연산으로 계산하므로 과거 구간 전체를 다시 조회할 필요가 없다.
+"""
+
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable
+import logging
+from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day
+from ..utils.trading_calendar import get_trading_calendar
+from ..data_source.data_source import DataSource, get_default_source
+from .market_store import MarketDataStore
+
+logger = logging.getLogger(__name__)
+
+FOREIGN_MARKETS = ['KOSPI', 'KOSDAQ']
+
+# pykrx 컬럼 → 표준 컬럼
+FOREIGN_COLUMNS = {
+    '상장주식수': 'listed_shares',
+    '보유수량': 'foreign_holding',
+    '지분율': 'foreign_ratio',
+    '한도수량': 'limit_shares',
+    '한도소진률': 'exhaustion_rate'
+}
+
+# 변화량을 계산할 컬럼과 기본 기간 (거래일)
+DELTA_COLUMNS = ['foreign_ratio', 'exhaustion_rate', 'foreign_holding']
+DEFAULT_DELTA_PERIODS = [1, 5, 20]
+
+class ForeignOwnershipCollector:
+    def __init__(self, source: DataSource = None, store: MarketDataStore = None):
+        self.source = source if source is not None else get_default_source()
+        self.store = store if store is not None else MarketDataStore()
+
+    def get_exhaustion_data(self, date: datetime = None) -> pd.DataFrame:
+        """전종목 외국인 보유/한도 소진율 (티커 인덱스, 시장 컬럼 포함)"""
+        if date is None:
+            date = datetime.now(KST)
+
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+
+        date_str = date.strftime('%Y%m%d')
+        return self._get_frames([date_str])[date_str]
+
+    def get_exhaustion_deltas(self, date: datetime = None, periods: Iterable[int] = None) -> pd.DataFrame:
+        """기준일 지분율/소진율과 1일·N일 변화량 (컬럼명: {컬럼}_chg_{N}d)"""
+        if date is None:
+            date = datetime.now(KST)
+
+        periods = sorted(set(periods or DEFAULT_DELTA_PERIODS))
+        # 최신순 거래일: recent[0]이 기준일, recent[N]이 N거래일 전
+        recent = get_trading_calendar().recent(date, periods[-1] + 1)
+        date_strs = [day.strftime('%Y%m%d') for day in recent]
+        # 기준일과 각 기간의 비교일만 조회
+        needed = [date_strs[0]] + [date_strs[p] for p in periods if p < len(date_strs)]
+        frames = self._get_frames(needed)
+
+        current = frames[date_strs[0]]
+        if current.empty:
+            return current
+
+        result = current.copy()
+        for period in periods:
+            past = frames.get(date_strs[period]) if period < len(date_strs) else None
+            if past is None or past.empty:
+                logger.warning(f"외국인 보유 비교 데이터 없음: {period}거래일 전")
+                for column in DELTA_COLUMNS:
+                    result[f"{column}_chg_{period}d"] = float('nan')
+                continue
+
+            # 티커 단위로 정렬해 한 번에 차감 (신규 상장 종목은 NaN)
+            aligned = past[DELTA_COLUMNS].reindex(result.index)
+            changes = result[DELTA_COLUMNS] - aligned
+            changes.columns = [f"{column}_chg_{period}d" for column in DELTA_COLUMNS]
+            result = result.join(changes)
+
+        logger.info(f"외국인 보유 변화량 계산 완료: {date_strs[0]} ({len(result)}개 종목)")
+        return result
+
+    def _get_frames(self, date_strs: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """날짜별 전종목 프레임. 저장소에 없는 (날짜, 시장)만 동시에 조회"""
+        parts: Dict[tuple, pd.DataFrame] = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {}
+            for date_str in dict.fromkeys(date_strs):
+                for market in FOREIGN_MARKETS:
+                    cached = self.store.read(date_str, f"foreign_exhaustion_{market}")
+                    if cached is not None:
+                        parts[(date_str, market)] = cached
+                    else:
+                        futures[(date_str, market)] = executor.submit(self._fetch, date_str, market)
+
+            for (date_str, market), future in futures.items():
+                try:
+                    frame = future.result()
+                except Exception as e:
+                    logger.warning(f"{market} 외국인 보유 데이터 수집 실패 ({date_str}): {e}")
+                    continue
+                parts[(date_str, market)] = frame
+                self.store.write(date_str, f"foreign_exhaustion_{market}", frame)
+
+        frames = {}
+        for date_str in dict.fromkeys(date_strs):
+            markets = []
+            for market in FOREIGN_MARKETS:
+                frame = parts.get((date_str, market))
+                if frame is not None and not frame.empty:
+                    markets.append(frame.assign(market=market))
+            if markets:
+                frames[date_str] = pd.concat(markets)
+            else:
+                logger.error(f"외국인 보유 데이터 수집 실패: {date_str}")
+                frames[date_str] = pd.DataFrame(columns=list(FOREIGN_COLUMNS.values()) + ['market'])
+        return frames
+
+    def _fetch(self, date_str: str, market: str) -> pd.DataFrame:
+        data = self.source.pykrx('get_exhaustion_rates_of_foreign_investment', date_str, market)
+        data = data.rename(columns=FOREIGN_COLUMNS).reindex(columns=list(FOREIGN_COLUMNS.values()))
+        data = data.astype(float)
+        data.index = data.index.astype(str)
+        data.index.name = '티커'
+        return data
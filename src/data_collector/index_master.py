@@ -0,0 +1,146 @@
+"""
+지수 마스터 테이블
+거래일마다 KRX 지수 코드 → 지수명 테이블을 시장별 코드 목록과 지수명 일괄 조회로 한 번 만들어 로컬에 저장하고,
+지수명 조회는 메모리 딕셔너리로 처리한다.
+"""
+
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+import glob
+import logging
+import os
+import threading
+from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day
+from ..data_source.data_source import DataSource, get_default_source
+
+logger = logging.getLogger(__name__)
+
+class IndexMaster:
+    COLUMNS = ['code', 'name', 'market']
+    MARKETS = ['KOSPI', 'KOSDAQ']
+
+    def __init__(self, data_dir: str = "data/index_master", source: DataSource = None):
+        self.data_dir = data_dir
+        self.source = source if source is not None else get_default_source()
+        self.date_str: Optional[str] = None
+        self.table = pd.DataFrame(columns=self.COLUMNS)
+        self._names: Dict[str, str] = {}
+        self._codes: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, date: datetime = None) -> pd.DataFrame:
+        """해당 거래일의 지수 마스터를 메모리에 준비 (로컬 파일 → KRX 수집 순)"""
+        if date is None:
+            date = datetime.now(KST)
+
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+
+        date_str = date.strftime('%Y%m%d')
+
+        with self._lock:
+            if self.date_str == date_str and not self.table.empty:
+                return self.table
+
+            table = self._load(date_str)
+            if table is None:
+                table = self._build(date_str)
+                if not table.empty:
+                    self._save(date_str, table)
+
+            if not table.empty:
+                self._set_table(date_str, table)
+            elif self.table.empty:
+                # 수집 실패 시 가장 최근에 저장된 마스터로 대체
+                latest = self._load_latest()
+                if latest is not None:
+                    self._set_table(*latest)
+
+            return self.table
+
+    def get_name(self, code: str, default: Optional[str] = None) -> Optional[str]:
+        self._ensure_loaded()
+        return self._names.get(str(code), default)
+
+    def get_code(self, name: str, market: str, default: Optional[str] = None) -> Optional[str]:
+        self._ensure_loaded()
+        return self._codes.get((market, name), default)
+
+    def get_codes(self, market: str = "ALL") -> List[str]:
+        self._ensure_loaded()
+        if self.table.empty:
+            return []
+        if market == "ALL":
+            return self.table['code'].tolist()
+        return self.table.loc[self.table['market'] == market, 'code'].tolist()
+
+    def _ensure_loaded(self):
+        if not self.table.empty:
+            return
+        with self._lock:
+            if not self.table.empty:
+                return
+            latest = self._load_latest()
+            if latest is not None:
+                self._set_table(*latest)
+                return
+        self.ensure()
+
+    def _set_table(self, date_str: str, table: pd.DataFrame):
+        self.date_str = date_str
+        self.table = table
+        self._names = dict(zip(table['code'], table['name']))
+        self._codes = {(market, name): code
+                       for code, name, market in zip(table['code'], table['name'], table['market'])}
+
+    def _build(self, date_str: str) -> pd.DataFrame:
+        frames = []
+        for market in self.MARKETS:
+            try:
+                codes = [str(code) for code in self.source.pykrx('get_index_ticker_list', date_str, market=market)]
+                if not codes:
+                    continue
+                # 지수명은 코드 목록 전체를 한 번에 조회 (목록을 넘기면 코드 인덱스의 Series 반환)
+                names = pd.Series(self.source.pykrx('get_index_ticker_name', codes))
+                names = names[~names.index.duplicated()].reindex(codes)
+                frames.append(pd.DataFrame({'code': codes, 'name': names.to_numpy(), 'market': market},
+                                           columns=self.COLUMNS))
+            except Exception as e:
+                logger.error(f"{market} 지수 마스터 수집 실패: {e}")
+
+        if not frames:
+            return pd.DataFrame(columns=self.COLUMNS)
+
+        table = pd.concat(frames, ignore_index=True).dropna(subset=['name']).drop_duplicates('code')
+        logger.info(f"지수 마스터 생성 완료: {date_str} ({len(table)}개 지수)")
+        return table
+
+    def _path(self, date_str: str) -> str:
+        return os.path.join(self.data_dir, f"index_master_{date_str}.csv")
+
+    def _load(self, date_str: str) -> Optional[pd.DataFrame]:
+        path = self._path(date_str)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_csv(path, dtype=str, encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"지수 마스터 파일 로드 실패 ({path}): {e}")
+            return None
+
+    def _load_latest(self):
+        paths = sorted(glob.glob(os.path.join(self.data_dir, "index_master_*.csv")))
+        for path in reversed(paths):
+            date_str = os.path.basename(path)[len("index_master_"):-len(".csv")]
+            table = self._load(date_str)
+            if table is not None and not table.empty:
+                return date_str, table
+        return None
+
+    def _save(self, date_str: str, table: pd.DataFrame):
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            table.to_csv(self._path(date_str), index=False, encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"지수 마스터 저장 실패: {e}")
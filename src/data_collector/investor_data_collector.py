@@ -1,15 +1,65 @@
-import pykrx.stock as stock
+import numpy as np
 import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
-from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day
+import re
+import threading
+import time
+from lxml import etree
+from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day, is_market_closed
+from ..data_source.data_source import DataSource, get_default_source
+from .investor_labels import get_investor_normalizer
+from .market_store import MarketDataStore
+from ..news_crawler.news_parser import _has_class, element_text, parse_document
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HOURLY_TIME_SLOTS = ["09:30", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00", "15:30"]
+
+# 투자자별 시간대별 거래 패턴 (실제 시장 분석 기반, HOURLY_TIME_SLOTS 순서)
+HOURLY_INVESTORS = ['개인', '외국인', '기관계', '금융투자', '투신', '연기금']
+HOURLY_WEIGHTS = np.array([
+    [0.25, 0.18, 0.12, 0.08, 0.10, 0.12, 0.10, 0.05],  # 개인: 장 시작에 활발, 마감 전 소극적
+    [0.15, 0.15, 0.15, 0.10, 0.15, 0.15, 0.10, 0.05],  # 외국인: 상대적으로 분산
+    [0.20, 0.12, 0.10, 0.08, 0.12, 0.15, 0.18, 0.05],  # 기관계: 장 시작과 마감 전 활발
+    [0.18, 0.15, 0.12, 0.10, 0.12, 0.15, 0.13, 0.05],  # 금융투자
+    [0.15, 0.13, 0.12, 0.10, 0.15, 0.15, 0.15, 0.05],  # 투신
+    [0.10, 0.12, 0.15, 0.12, 0.15, 0.15, 0.16, 0.05],  # 연기금: 상대적으로 균등하게 분산
+    [0.20, 0.15, 0.12, 0.08, 0.12, 0.15, 0.13, 0.05],  # 그 외 투자자 기본 가중치
+])
+HOURLY_WEIGHT_ROWS = {investor: row for row, investor in enumerate(HOURLY_INVESTORS)}
+HOURLY_MARKET_SEEDS = {'kospi': 1, 'kosdaq': 2}
+
+# 종목별 순매수 수집 대상 투자자 (pykrx 투자자 구분 → 컬럼명, 순매수 거래대금 원 단위)
+NET_PURCHASE_INVESTORS = {
+    '외국인': 'foreign_net',
+    '기관합계': 'institution_net',
+    '개인': 'individual_net',
+    '연기금': 'pension_net'
+}
+NET_PURCHASE_MARKETS = ['KOSPI', 'KOSDAQ']
+
+# 네이버 금융 프로그램 매매 동향 (시장 코드, 표 컬럼 순서, 억원)
+PROGRAM_TRADING_MARKETS = {'KOSPI': '01', 'KOSDAQ': '02'}
+PROGRAM_TRADING_COLUMNS = [
+    'arbitrage_buy', 'arbitrage_sell', 'arbitrage_net',
+    'non_arbitrage_buy', 'non_arbitrage_sell', 'non_arbitrage_net',
+    'total_buy', 'total_sell', 'total_net'
+]
+PROGRAM_DATE_PATTERN = re.compile(r'^\d{2}\.\d{2}\.\d{2}$')
+# 일자별 프로그램 매매 표(table.type_1)를 먼저 찾고 그 안의 데이터 행과 셀만 조회
+PROGRAM_TABLE_XPATH = etree.XPath(f"//{_has_class('table', 'type_1')}")
+PROGRAM_ROW_XPATH = etree.XPath('.//tr[td]')
+PROGRAM_CELL_XPATH = etree.XPath('./td')
+
 class InvestorDataCollector:
-    def __init__(self):
+    def __init__(self, source: DataSource = None, live_ttl: float = 60.0, store: MarketDataStore = None):
+        self.source = source if source is not None else get_default_source()
+        # 종목별 투자자 순매수 등 일자별 프레임 저장소
+        self.store = store if store is not None else MarketDataStore()
         self.investor_types = {
             '개인': '개인',
             '외국인': '외인',
@@ -18,6 +68,15 @@ class InvestorDataCollector:
             '투신': '투신',
             '연기금': '연기금'
         }
+        # 원본 투자자 라벨 → 표준 유형 변환 테이블 (프로세스 공용)
+        self.normalizer = get_investor_normalizer()
+        # 거래일별 투자자 데이터 (date_str -> (결과, 만료 시각)). 확정값은 만료 없음,
+        # 장중 값은 live_ttl초 동안만 재사용 (일별/시간대별 경로가 같은 결과를 공유)
+        self.live_ttl = live_ttl
+        self._daily_cache = {}
+        # 같은 날짜를 동시에 요청하면 진행 중인 수집 하나를 공유 (single-flight)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
     
     def get_investor_trading_data(self, date: datetime = None) -> Dict:
         if date is None:
@@ -28,11 +87,44 @@ class InvestorDataCollector:
             
         date_str = date.strftime('%Y%m%d')
         
+        with self._lock:
+            cached = self._cache_get(date_str)
+            if cached is not None:
+                return cached
+            
+            future = self._inflight.get(date_str)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[date_str] = future
+        
+        if not leader:
+            # 다른 호출자가 수집 중인 결과를 기다림
+            return future.result()
+        
+        try:
+            result = self._fetch_investor_trading_data(date, date_str)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            # 대기 중인 호출자가 영원히 블록되지 않도록 예외도 전달
+            if not future.done():
+                future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(date_str, None)
+    
+    def _fetch_investor_trading_data(self, date: datetime, date_str: str) -> Dict:
         try:
-            # KOSPI 투자자별 거래 데이터
-            kospi_data = stock.get_market_trading_value_by_investor(date_str, date_str, "KOSPI")
-            # KOSDAQ 투자자별 거래 데이터  
-            kosdaq_data = stock.get_market_trading_value_by_investor(date_str, date_str, "KOSDAQ")
+            # KOSPI/KOSDAQ 투자자별 거래 데이터 동시 수집
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                kospi_future = executor.submit(
+                    self.source.pykrx, 'get_market_trading_value_by_investor', date_str, date_str, "KOSPI")
+                kosdaq_future = executor.submit(
+                    self.source.pykrx, 'get_market_trading_value_by_investor', date_str, date_str, "KOSDAQ")
+                kospi_data = kospi_future.result()
+                kosdaq_data = kosdaq_future.result()
             
             result = {
                 'date': date.strftime('%Y-%m-%d'),
@@ -41,6 +133,8 @@ class InvestorDataCollector:
             }
             
             logger.info(f"투자자별 거래 데이터 수집 완료: {date_str}")
+            with self._lock:
+                self._cache_put(date_str, result, self.is_final(date))
             return result
             
         except Exception as e:
@@ -51,59 +145,144 @@ class InvestorDataCollector:
                 'kosdaq': {}
             }
     
-    def _process_investor_data(self, data: pd.DataFrame) -> Dict:
-        if data.empty:
-            return {}
+    def _cache_get(self, date_str: str) -> Optional[Dict]:
+        entry = self._daily_cache.get(date_str)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._daily_cache[date_str]
+            return None
+        return result
+    
+    def _cache_put(self, date_str: str, result: Dict, final: bool):
+        expires_at = None if final else time.monotonic() + self.live_ttl
+        self._daily_cache[date_str] = (result, expires_at)
+    
+    def prefetch_investor_range(self, start: datetime, end: datetime) -> int:
+        """기간 조회 1회(시장별)로 거래일별 투자자 데이터를 미리 채움"""
+        from_str = start.strftime('%Y%m%d')
+        to_str = end.strftime('%Y%m%d')
         
-        result = {}
+        markets = {}
+        for market in ['KOSPI', 'KOSDAQ']:
+            try:
+                # 일별 순매수 추이 (상세 투자자 구분)
+                markets[market] = self.source.pykrx('get_market_trading_value_by_date', from_str, to_str, market, detail=True)
+            except Exception as e:
+                logger.warning(f"{market} 투자자별 기간 데이터 수집 실패: {e}")
+                return 0
         
-        # 실제 데이터는 인덱스에 투자자 구분이 있고, '순매수' 컬럼에 값이 있음
-        if '순매수' in data.columns:
-            # 투자자별 매핑 테이블
-            investor_mapping = {
-                '개인': ['개인'],
-                '외국인': ['외국인'],
-                '기관계': ['기관합계', '기관'],
-                '금융투자': ['금융투자', '증권'],
-                '투신': ['투신'],
-                '연기금': ['연기금 등', '연기금', '국민연금'],
-                '보험': ['보험'],
-                '사모': ['사모']
-            }
+        institution_columns = ['금융투자', '보험', '투신', '사모', '은행', '기타금융', '연기금']
+        days = markets['KOSPI'].index.intersection(markets['KOSDAQ'].index)
+        days = [day for day in days if self.is_final(day)]
+        
+        normalized = {}
+        for market, frame in markets.items():
+            frame = frame.loc[days].copy()
+            # 일별 추이 상세 조회에는 기관합계가 없으므로 세부 기관 합산
+            frame['기관합계'] = frame.reindex(columns=institution_columns).fillna(0).sum(axis=1)
+            # 기간 전체를 한 번에 표준 투자자 유형 컬럼으로 변환
+            normalized[market] = self.normalizer.normalize_columns(frame)
+        
+        filled = 0
+        for day in days:
+            day_result = {'date': day.strftime('%Y-%m-%d')}
+            for market, frame in normalized.items():
+                day_result[market.lower()] = {label: float(value) for label, value in frame.loc[day].items()}
             
-            # 인덱스(투자자구분)를 기준으로 데이터 처리
-            for investor_raw in data.index:
-                if investor_raw in ['전체', '기타외국인']:  # 제외할 항목
-                    continue
-                    
-                # 순매수 금액 (이미 원 단위이므로 억원으로 변환)
-                value = data.loc[investor_raw, '순매수'] / 100000000
+            with self._lock:
+                self._cache_put(day.strftime('%Y%m%d'), day_result, final=True)
+            filled += 1
+        
+        logger.info(f"투자자별 기간 데이터 사전 수집 완료: {from_str}~{to_str} ({filled}일)")
+        return filled
+    
+    def get_ticker_net_purchases(self, date: datetime = None) -> pd.DataFrame:
+        """전종목 투자자별 순매수 거래대금(원) (티커 × 투자자) 프레임
+        
+        시장 × 투자자별 벌크 조회(최대 8회)를 동시에 수행하며, 종목별 호출은 하지 않는다.
+        """
+        if date is None:
+            date = datetime.now(KST)
+            
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+            
+        date_str = date.strftime('%Y%m%d')
+        columns = list(NET_PURCHASE_INVESTORS.values())
+        
+        frames = {}
+        missing = []
+        for market in NET_PURCHASE_MARKETS:
+            cached = self.store.read(date_str, f"net_purchases_{market}")
+            if cached is not None:
+                frames[market] = cached
+            else:
+                missing.append(market)
+        
+        if missing:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    (market, investor): executor.submit(
+                        self.source.pykrx, 'get_market_net_purchases_of_equities', date_str, date_str, market, investor)
+                    for market in missing
+                    for investor in NET_PURCHASE_INVESTORS
+                }
+            
+            for market in missing:
+                series = []
+                for investor, column in NET_PURCHASE_INVESTORS.items():
+                    try:
+                        data = futures[(market, investor)].result()
+                        if not data.empty:
+                            series.append(data['순매수거래대금'].rename(column))
+                    except Exception as e:
+                        logger.warning(f"{market} {investor} 종목별 순매수 수집 실패: {e}")
                 
-                # 표준화된 투자자 유형으로 매핑
-                mapped_type = None
-                for standard_type, variations in investor_mapping.items():
-                    if any(var in investor_raw for var in variations):
-                        mapped_type = standard_type
-                        break
+                if not series:
+                    continue
                 
-                if mapped_type:
-                    # 이미 같은 타입이 있으면 합산 (예: 기관 하위 분류들)
-                    if mapped_type in result:
-                        result[mapped_type] += round(value, 1)
-                    else:
-                        result[mapped_type] = round(value, 1)
-                else:
-                    # 매핑되지 않은 투자자는 그대로 저장
-                    result[investor_raw] = round(value, 1)
+                frame = pd.concat(series, axis=1).reindex(columns=columns).fillna(0).astype('int64')
+                frame.index = frame.index.astype(str)
+                frame.index.name = '티커'
+                frames[market] = frame
+                # 일부 투자자 수집에 실패한 프레임은 저장하지 않아 다음 실행에서 다시 수집
+                if len(series) == len(NET_PURCHASE_INVESTORS):
+                    self.store.write(date_str, f"net_purchases_{market}", frame)
         
-        # 표준 투자자 유형 중 누락된 것은 0으로 설정
-        standard_types = ['개인', '외국인', '기관계', '금융투자', '투신', '연기금']
-        for investor_type in standard_types:
-            if investor_type not in result:
-                result[investor_type] = 0.0
+        if not frames:
+            logger.error(f"종목별 투자자 순매수 수집 실패: {date_str}")
+            return pd.DataFrame(columns=columns)
         
+        result = pd.concat(frames.values())
+        result = result[~result.index.duplicated(keep='first')]
+        logger.info(f"종목별 투자자 순매수 수집 완료: {date_str} ({len(result)}개 종목)")
         return result
     
+    def join_net_purchases(self, stock_data: pd.DataFrame, net_purchases: pd.DataFrame) -> pd.DataFrame:
+        """주식 데이터(ticker 컬럼)에 종목별 투자자 순매수 컬럼 결합 (없는 종목은 0)"""
+        columns = list(NET_PURCHASE_INVESTORS.values())
+        if stock_data.empty:
+            return stock_data
+        
+        joined = stock_data.drop(columns=columns, errors='ignore').join(
+            net_purchases.reindex(columns=columns), on='ticker')
+        joined[columns] = joined[columns].fillna(0).astype('int64')
+        return joined
+    
+    def is_final(self, date: datetime) -> bool:
+        """장 마감 후 또는 과거 거래일의 데이터만 확정값으로 취급"""
+        now = datetime.now(KST)
+        if date.strftime('%Y%m%d') < now.strftime('%Y%m%d'):
+            return True
+        return is_market_closed(now)
+    
+    def _process_investor_data(self, data: pd.DataFrame) -> Dict:
+        # 실제 데이터는 인덱스에 투자자 구분이 있고, '순매수' 컬럼에 값이 있음
+        # 라벨 → 표준 투자자 유형 변환과 억원 단위 합산은 정규화 테이블에서 일괄 처리
+        return self.normalizer.aggregate(data, '순매수')
+    
     def get_hourly_investor_data(self, date: datetime = None) -> Dict:
         if date is None:
             date = datetime.now(KST)
@@ -115,7 +294,7 @@ class InvestorDataCollector:
         
         try:
             # 시간대별 지수 변화율과 투자자 거래 데이터 수집
-            time_slots = ["09:30", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00", "15:30"]
+            time_slots = HOURLY_TIME_SLOTS
             
             # 일일 투자자 데이터 가져오기
             daily_data = self.get_investor_trading_data(date)
@@ -123,12 +302,15 @@ class InvestorDataCollector:
             # 시간대별 지수 데이터 수집 시도
             hourly_index_data = self._get_hourly_index_data(date, time_slots)
             
+            # 투자자별 거래량 분배 (일일 데이터 기반 추정, 시장별 하루치를 한 번에 계산)
+            kospi_hourly = self._distribute_hourly_data(daily_data['kospi'], date_str, 'kospi')
+            kosdaq_hourly = self._distribute_hourly_data(daily_data['kosdaq'], date_str, 'kosdaq')
+            
             # 거래 시간대별로 데이터 조합
             hourly_data = {}
             for time_slot in time_slots:
-                # 투자자별 거래량 분배 (일일 데이터 기반 추정)
-                kospi_investor = self._distribute_hourly_data(daily_data['kospi'], time_slot)
-                kosdaq_investor = self._distribute_hourly_data(daily_data['kosdaq'], time_slot)
+                kospi_investor = kospi_hourly[time_slot]
+                kosdaq_investor = kosdaq_hourly[time_slot]
                 
                 # 지수 변화율 정보 추가
                 index_changes = hourly_index_data.get(time_slot, {'kospi_change': 0, 'kosdaq_change': 0})
@@ -200,93 +382,35 @@ class InvestorDataCollector:
             # 기본값 반환
             return {time_slot: {'kospi_change': 0, 'kosdaq_change': 0} for time_slot in time_slots}
     
-    def _distribute_hourly_data(self, daily_data: Dict, time_slot: str) -> Dict:
-        # 투자자별 시간대별 거래 패턴 (실제 시장 분석 기반)
-        investor_time_patterns = {
-            '개인': {
-                "09:30": 0.25,  # 개인은 장 시작에 활발
-                "10:00": 0.18,
-                "11:00": 0.12,
-                "12:00": 0.08,  # 점심시간 전 거래량 감소
-                "13:00": 0.10,
-                "14:00": 0.12,
-                "15:00": 0.10,
-                "15:30": 0.05   # 마감 전 소극적
-            },
-            '외국인': {
-                "09:30": 0.15,  # 외국인은 상대적으로 분산
-                "10:00": 0.15,
-                "11:00": 0.15,
-                "12:00": 0.10,
-                "13:00": 0.15,
-                "14:00": 0.15,
-                "15:00": 0.10,
-                "15:30": 0.05
-            },
-            '기관계': {
-                "09:30": 0.20,  # 기관은 장 시작과 마감 전 활발
-                "10:00": 0.12,
-                "11:00": 0.10,
-                "12:00": 0.08,
-                "13:00": 0.12,
-                "14:00": 0.15,
-                "15:00": 0.18,
-                "15:30": 0.05
-            },
-            '금융투자': {
-                "09:30": 0.18,
-                "10:00": 0.15,
-                "11:00": 0.12,
-                "12:00": 0.10,
-                "13:00": 0.12,
-                "14:00": 0.15,
-                "15:00": 0.13,
-                "15:30": 0.05
-            },
-            '투신': {
-                "09:30": 0.15,
-                "10:00": 0.13,
-                "11:00": 0.12,
-                "12:00": 0.10,
-                "13:00": 0.15,
-                "14:00": 0.15,
-                "15:00": 0.15,
-                "15:30": 0.05
-            },
-            '연기금': {
-                "09:30": 0.10,  # 연기금은 상대적으로 균등하게 분산
-                "10:00": 0.12,
-                "11:00": 0.15,
-                "12:00": 0.12,
-                "13:00": 0.15,
-                "14:00": 0.15,
-                "15:00": 0.16,
-                "15:30": 0.05
-            }
-        }
+    def _distribute_hourly_data(self, daily_data: Dict, date_str: str, market: str) -> Dict:
+        """일일 순매수를 시간대별로 분배한 추정치 {시간대: {투자자: 억원}}
         
-        result = {}
-        for investor, daily_value in daily_data.items():
-            if investor in investor_time_patterns:
-                weight = investor_time_patterns[investor].get(time_slot, 0.125)
-            else:
-                # 기본 가중치
-                default_weights = {
-                    "09:30": 0.20, "10:00": 0.15, "11:00": 0.12, "12:00": 0.08,
-                    "13:00": 0.12, "14:00": 0.15, "15:00": 0.13, "15:30": 0.05
-                }
-                weight = default_weights.get(time_slot, 0.125)
-            
-            # 시간대별 변동성 추가 (±20% 내외)
-            import random
-            random.seed(hash(f"{time_slot}_{investor}"))
-            variation = random.uniform(0.8, 1.2)
-            
-            result[investor] = round(daily_value * weight * variation, 1)
+        (투자자 × 시간대) 가중치 행렬에 일일 값을 한 번에 곱하고, 시간대별 변동(±20%)은
+        날짜/시장으로 시드를 고정한 난수 생성기로 만들어 프로세스가 달라도 같은 결과를 낸다.
+        """
+        if not daily_data:
+            return {time_slot: {} for time_slot in HOURLY_TIME_SLOTS}
         
-        return result
+        investors = list(daily_data.keys())
+        values = np.array([daily_data[investor] for investor in investors], dtype=float)
+        rows = [HOURLY_WEIGHT_ROWS.get(investor, len(HOURLY_INVESTORS)) for investor in investors]
+        
+        rng = np.random.default_rng([int(date_str), HOURLY_MARKET_SEEDS[market]])
+        variation = rng.uniform(0.8, 1.2, size=(len(investors), len(HOURLY_TIME_SLOTS)))
+        
+        hourly = np.round(values[:, None] * HOURLY_WEIGHTS[rows] * variation, 1)
+        
+        return {
+            time_slot: {investor: float(value) for investor, value in zip(investors, hourly[:, i])}
+            for i, time_slot in enumerate(HOURLY_TIME_SLOTS)
+        }
     
     def get_program_trading_data(self, date: datetime = None) -> Dict:
+        """시장별 프로그램 매매(차익/비차익/전체) 매수·매도·순매수 (억원)
+        
+        pykrx에는 프로그램 매매 조회가 없으므로 네이버 금융 일별 프로그램 매매 동향을 사용한다.
+        한 페이지에 기준일 이전 여러 거래일이 포함되므로 함께 저장소에 기록해 이력으로 사용한다.
+        """
         if date is None:
             date = datetime.now(KST)
             
@@ -294,30 +418,86 @@ class InvestorDataCollector:
             date = get_previous_trading_day(date)
             
         date_str = date.strftime('%Y%m%d')
+        empty_result = {
+            'date': date.strftime('%Y-%m-%d'),
+            'program_buy': 0,
+            'program_sell': 0,
+            'program_net': 0,
+            'kospi': {},
+            'kosdaq': {}
+        }
         
         try:
-            # 프로그램 매매 데이터
-            program_data = stock.get_market_trading_volume_by_date(date_str, date_str, "KOSPI")
+            program_data = self.store.read(date_str, 'program_trading')
+            if program_data is None:
+                program_data = self._fetch_program_trading(date_str)
+            
+            if program_data is None or program_data.empty:
+                logger.warning(f"프로그램 매매 데이터 없음: {date_str}")
+                return empty_result
+            
+            markets = {market.lower(): {column: float(value) for column, value in row.items()}
+                       for market, row in program_data.iterrows()}
+            kospi = markets.get('kospi', {})
             
             result = {
                 'date': date.strftime('%Y-%m-%d'),
-                'program_buy': 0,
-                'program_sell': 0,
-                'program_net': 0
+                'program_buy': kospi.get('total_buy', 0),
+                'program_sell': kospi.get('total_sell', 0),
+                'program_net': kospi.get('total_net', 0),
+                'kospi': kospi,
+                'kosdaq': markets.get('kosdaq', {})
             }
             
-            if not program_data.empty and '프로그램' in program_data.columns:
-                program_volume = program_data['프로그램'].iloc[0]
-                result['program_net'] = program_volume / 100000000  # 억원 단위
-            
             logger.info(f"프로그램 매매 데이터 수집 완료: {date_str}")
             return result
             
         except Exception as e:
             logger.error(f"프로그램 매매 데이터 수집 실패: {e}")
-            return {
-                'date': date.strftime('%Y-%m-%d'),
-                'program_buy': 0,
-                'program_sell': 0,
-                'program_net': 0
-            }
\ No newline at end of file
+            return empty_result
+    
+    def _fetch_program_trading(self, date_str: str) -> Optional[pd.DataFrame]:
+        """네이버 일별 프로그램 매매 동향 (시장별 1페이지)을 거래일별 프레임으로 저장"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pages = {market: executor.submit(self._fetch_program_trading_page, date_str, code)
+                     for market, code in PROGRAM_TRADING_MARKETS.items()}
+            rows = {market: future.result() for market, future in pages.items()}
+        
+        # 두 시장이 모두 있는 거래일만 저장 (기준일 이전 거래일도 함께 기록)
+        days = set(rows['KOSPI']).intersection(rows['KOSDAQ'])
+        for day_str in days:
+            frame = pd.DataFrame({market: rows[market][day_str] for market in PROGRAM_TRADING_MARKETS}).T
+            frame.index.name = 'market'
+            self.store.write(day_str, 'program_trading', frame)
+        
+        if date_str not in days:
+            return None
+        return pd.DataFrame({market: rows[market][date_str] for market in PROGRAM_TRADING_MARKETS}).T
+    
+    def _fetch_program_trading_page(self, date_str: str, market_code: str) -> Dict[str, Dict[str, float]]:
+        url = f"https://finance.naver.com/sise/programDealTrendDay.naver?bizdate={date_str}&sosok={market_code}"
+        response = self.source.http_get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+        response.raise_for_status()
+        
+        document = parse_document(response.content, response.encoding)
+        tables = PROGRAM_TABLE_XPATH(document)
+        if not tables:
+            logger.warning(f"프로그램 매매 표를 찾을 수 없습니다: {url}")
+            return {}
+        
+        rows = {}
+        # 날짜 형식/셀 수 검사는 표 안의 머리글·구분 행을 거르는 2차 조건
+        for tr in (tr for table in tables for tr in PROGRAM_ROW_XPATH(table)):
+            cells = [element_text(td) for td in PROGRAM_CELL_XPATH(tr)]
+            if len(cells) < len(PROGRAM_TRADING_COLUMNS) + 1 or not PROGRAM_DATE_PATTERN.match(cells[0]):
+                continue
+            
+            try:
+                values = [float(cell.replace(',', '')) for cell in cells[1:len(PROGRAM_TRADING_COLUMNS) + 1]]
+            except ValueError:
+                continue
+            
+            day_str = datetime.strptime(cells[0], '%y.%m.%d').strftime('%Y%m%d')
+            rows[day_str] = dict(zip(PROGRAM_TRADING_COLUMNS, values))
+        
+        return rows
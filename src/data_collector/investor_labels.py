@@ -0,0 +1,101 @@
+"""
+투자자 구분 라벨 정규화
+KRX 원본 투자자 라벨(기관합계, 연기금 등 ...)을 표준 투자자 유형으로 바꾸는 조회 테이블.
+라벨 해석 결과는 메모해 두고, 금액 집계는 프레임 단위 groupby로 처리하므로
+일별 요약(12행)뿐 아니라 기간별/종목별 프레임에도 그대로 사용할 수 있다.
+"""
+
+import pandas as pd
+from typing import Dict, Optional
+import threading
+
+# 표준 투자자 유형 → 원본 라벨에 포함되는 문자열 (앞에 있는 유형이 우선)
+INVESTOR_MAPPING = {
+    '개인': ['개인'],
+    '외국인': ['외국인'],
+    '기관계': ['기관합계', '기관'],
+    '금융투자': ['금융투자', '증권'],
+    '투신': ['투신'],
+    '연기금': ['연기금 등', '연기금', '국민연금'],
+    '보험': ['보험'],
+    '사모': ['사모']
+}
+
+# 집계에서 제외할 라벨
+EXCLUDED_LABELS = {'전체', '기타외국인'}
+
+# 결과에 항상 포함되는 표준 유형 (없으면 0.0)
+STANDARD_TYPES = ['개인', '외국인', '기관계', '금융투자', '투신', '연기금']
+
+# 원 → 억원
+UNIT = 100000000
+
+class InvestorLabelNormalizer:
+    def __init__(self):
+        # 정확히 일치하는 라벨은 미리 계산, 처음 보는 라벨은 최초 해석 후 메모
+        self._resolved: Dict[str, Optional[str]] = {label: None for label in EXCLUDED_LABELS}
+        for variations in INVESTOR_MAPPING.values():
+            for variation in variations:
+                self._resolved[variation] = self._match(variation)
+        self._lock = threading.Lock()
+
+    def resolve(self, label: str) -> Optional[str]:
+        """표준 유형 (매핑되지 않으면 원본 라벨, 제외 대상이면 None)"""
+        try:
+            return self._resolved[label]
+        except KeyError:
+            pass
+
+        resolved = self._match(label)
+        with self._lock:
+            self._resolved[label] = resolved
+        return resolved
+
+    def aggregate(self, data: pd.DataFrame, column: str = '순매수') -> Dict:
+        """투자자 라벨 인덱스 프레임을 표준 유형별 금액(억원) 딕셔너리로 집계"""
+        if data.empty:
+            return {}
+
+        result = {}
+        if column in data.columns:
+            values = self._group(data[column], data.index)
+            result = {label: float(value) for label, value in values.items()}
+
+        for investor_type in STANDARD_TYPES:
+            if investor_type not in result:
+                result[investor_type] = 0.0
+
+        return result
+
+    def normalize_columns(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """투자자 라벨이 컬럼인 프레임(일자별/종목별)을 표준 유형 컬럼의 억원 프레임으로 변환"""
+        if frame.empty:
+            return pd.DataFrame(columns=STANDARD_TYPES)
+
+        normalized = self._group(frame.T, frame.columns).T
+        missing = [investor_type for investor_type in STANDARD_TYPES if investor_type not in normalized.columns]
+        for investor_type in missing:
+            normalized[investor_type] = 0.0
+        return normalized
+
+    def _group(self, values, labels: pd.Index):
+        """라벨별로 억원 변환 및 소수 첫째 자리 반올림 후 표준 유형 단위로 합산"""
+        keys = pd.Index([self.resolve(str(label)) for label in labels])
+        mask = keys.notna()
+        rounded = (values[mask].astype(float) / UNIT).round(1)
+        return rounded.groupby(keys[mask], sort=False).sum()
+
+    @staticmethod
+    def _match(label: str) -> Optional[str]:
+        if label in EXCLUDED_LABELS:
+            return None
+        for standard_type, variations in INVESTOR_MAPPING.items():
+            if any(variation in label for variation in variations):
+                return standard_type
+        return label
+
+
+_normalizer = InvestorLabelNormalizer()
+
+def get_investor_normalizer() -> InvestorLabelNormalizer:
+    return _normalizer
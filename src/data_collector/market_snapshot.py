@@ -0,0 +1,117 @@
+"""
+일자별 전종목 시세 스냅샷
+(date, market) 단위로 전종목 OHLCV를 한 번만 수집해 메모리에 보관하고,
+배치 처리와 후속 분석은 이 스냅샷을 잘라서 사용한다.
+"""
+
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Tuple
+import logging
+import threading
+from .market_store import MarketDataStore
+from ..data_source.data_source import DataSource, get_default_source
+
+logger = logging.getLogger(__name__)
+
+class MarketSnapshot:
+    """특정 거래일/시장의 전종목 OHLCV 프레임 (티커 인덱스)"""
+
+    def __init__(self, date_str: str, market: str, ohlcv: pd.DataFrame):
+        self.date_str = date_str
+        self.market = market
+        self.ohlcv = ohlcv if ohlcv is not None else pd.DataFrame()
+
+    @property
+    def empty(self) -> bool:
+        return self.ohlcv.empty
+
+    @property
+    def has_change_rate(self) -> bool:
+        """당일 프레임에 등락률 컬럼이 있으면 전일 시세 없이 전일 종가를 역산할 수 있음"""
+        return not self.ohlcv.empty and '등락률' in self.ohlcv.columns
+
+    def close(self) -> pd.Series:
+        if self.ohlcv.empty:
+            return pd.Series(dtype=float)
+        return self.ohlcv['종가']
+
+    def previous_close(self) -> pd.Series:
+        """당일 종가와 등락률로 전일 종가 역산 (원 단위 반올림)"""
+        if not self.has_change_rate:
+            return pd.Series(dtype=float)
+
+        close = self.ohlcv['종가'].astype(float)
+        rate = self.ohlcv['등락률'].astype(float)
+        ratio = 1 + rate / 100
+
+        previous = (close / ratio.where(ratio > 0)).round()
+        # 거래정지 등으로 종가가 0이면 전일 종가도 알 수 없음
+        return previous.where(close > 0, 0).fillna(0)
+
+
+class MarketSnapshotCache:
+    """(date, market) 키로 스냅샷을 한 번만 수집하는 메모리 캐시"""
+
+    def __init__(self, max_entries: int = 8, store: MarketDataStore = None, source: DataSource = None):
+        self.max_entries = max_entries
+        self.store = store
+        self.source = source if source is not None else get_default_source()
+        self._snapshots: "OrderedDict[Tuple[str, str], MarketSnapshot]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, date_str: str, market: str = "ALL") -> MarketSnapshot:
+        key = (date_str, market)
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+                return snapshot
+
+            # 같은 키를 동시에 요청하면 진행 중인 수집 하나를 공유 (다른 키는 병렬로 수집)
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            snapshot = self._fetch(date_str, market)
+            with self._lock:
+                # 빈 결과는 캐시하지 않아 다음 호출에서 재시도
+                if not snapshot.empty:
+                    self._snapshots[key] = snapshot
+                    while len(self._snapshots) > self.max_entries:
+                        self._snapshots.popitem(last=False)
+            future.set_result(snapshot)
+            return snapshot
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def _fetch(self, date_str: str, market: str) -> MarketSnapshot:
+        name = f"ohlcv_{market}"
+        if self.store is not None:
+            ohlcv = self.store.read(date_str, name)
+            if ohlcv is not None:
+                logger.info(f"전종목 시세 스냅샷 저장소 로드: {date_str} {market} ({len(ohlcv)}개 종목)")
+                return MarketSnapshot(date_str, market, ohlcv)
+
+        ohlcv = self.source.pykrx('get_market_ohlcv', date_str, market=market)
+        logger.info(f"전종목 시세 스냅샷 수집 완료: {date_str} {market} ({len(ohlcv)}개 종목)")
+        if self.store is not None:
+            self.store.write(date_str, name, ohlcv)
+        return MarketSnapshot(date_str, market, ohlcv)
@@ -0,0 +1,107 @@
+"""
+로컬 시장 데이터 저장소
+거래일별 디렉토리(date=YYYYMMDD)에 전종목 OHLCV, 지수 OHLCV 등을 컬럼형 파일로 저장한다.
+수집기는 KRX를 호출하기 전에 저장소를 먼저 확인하고(read-through),
+수집에 성공하면 저장소에 기록한다(write-through).
+"""
+
+import pandas as pd
+from datetime import datetime
+from typing import Iterable, List, Optional
+import logging
+import os
+import threading
+from ..utils.market_utils import KST, is_market_closed
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+class MarketDataStore:
+    def __init__(self, root_dir: str = "data/market_store"):
+        self.root_dir = root_dir
+        # pyarrow가 없으면 pickle로 저장 (컬럼 단위 읽기는 불가)
+        self.extension = 'parquet' if PARQUET_AVAILABLE else 'pkl'
+        self._lock = threading.Lock()
+        if not PARQUET_AVAILABLE:
+            logger.warning("pyarrow를 찾을 수 없습니다. 시장 데이터 저장소를 pickle 형식으로 사용합니다.")
+
+    def path(self, date_str: str, name: str) -> str:
+        return os.path.join(self.root_dir, f"date={date_str}", f"{name}.{self.extension}")
+
+    def has(self, date_str: str, name: str) -> bool:
+        return os.path.exists(self.path(date_str, name))
+
+    def read(self, date_str: str, name: str, columns: List[str] = None) -> Optional[pd.DataFrame]:
+        path = self.path(date_str, name)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            if self.extension == 'parquet':
+                return pd.read_parquet(path, columns=columns)
+            df = pd.read_pickle(path)
+            return df[columns] if columns else df
+        except Exception as e:
+            logger.warning(f"저장소 데이터 로드 실패 ({path}): {e}")
+            return None
+
+    def write(self, date_str: str, name: str, df: pd.DataFrame) -> bool:
+        if df is None or df.empty or not self.can_persist(date_str):
+            return False
+
+        path = self.path(date_str, name)
+        tmp_path = f"{path}.tmp"
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.extension == 'parquet':
+                    df.to_parquet(tmp_path)
+                else:
+                    df.to_pickle(tmp_path)
+                os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.warning(f"저장소 데이터 저장 실패 ({path}): {e}")
+            return False
+
+    def can_persist(self, date_str: str) -> bool:
+        """장 마감 전 당일 데이터는 확정값이 아니므로 저장하지 않음"""
+        now = datetime.now(KST)
+        today_str = now.strftime('%Y%m%d')
+        if date_str < today_str:
+            return True
+        return date_str == today_str and is_market_closed(now)
+
+    def read_panel(self, dates: Iterable[str], name: str, column: str) -> pd.DataFrame:
+        """(날짜 × 티커/지수명) 패널 조회. 저장되지 않은 날짜는 제외"""
+        rows = {}
+        for date_str in dates:
+            df = self.read(date_str, name, columns=[column])
+            if df is not None and column in df.columns:
+                rows[date_str] = df[column]
+
+        if not rows:
+            return pd.DataFrame()
+
+        panel = pd.DataFrame(rows).T
+        panel.index = pd.to_datetime(panel.index, format='%Y%m%d')
+        panel.index.name = '날짜'
+        return panel.sort_index()
+
+    def stored_dates(self, name: str = None) -> List[str]:
+        if not os.path.isdir(self.root_dir):
+            return []
+
+        dates = []
+        for entry in os.listdir(self.root_dir):
+            if not entry.startswith('date='):
+                continue
+            date_str = entry[len('date='):]
+            if name is None or self.has(date_str, name):
+                dates.append(date_str)
+        return sorted(dates)
@@ -0,0 +1,99 @@
+"""
+공매도 데이터 수집
+전종목 공매도 거래량(당일)과 공매도 잔고(결제 지연으로 2거래일 늦게 공시)를
+시장별 벌크 조회로 받아 거래일별로 저장소에 기록한다. 종목별 조회는 하지 않는다.
+"""
+
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict
+import logging
+from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day
+from ..data_source.data_source import DataSource, get_default_source
+from .market_store import MarketDataStore
+
+logger = logging.getLogger(__name__)
+
+SHORT_MARKETS = ['KOSPI', 'KOSDAQ']
+
+# pykrx 컬럼 → 표준 컬럼
+SHORT_VOLUME_COLUMNS = {
+    '공매도': 'short_volume',
+    '매수': 'total_volume',
+    '비중': 'short_volume_ratio'
+}
+SHORT_BALANCE_COLUMNS = {
+    '공매도잔고': 'short_balance',
+    '상장주식수': 'listed_shares',
+    '공매도금액': 'short_balance_value',
+    '시가총액': 'market_cap',
+    '비중': 'short_balance_ratio'
+}
+
+class ShortSellingCollector:
+    def __init__(self, source: DataSource = None, store: MarketDataStore = None):
+        self.source = source if source is not None else get_default_source()
+        self.store = store if store is not None else MarketDataStore()
+
+    def get_short_selling_data(self, date: datetime = None) -> pd.DataFrame:
+        """전종목 공매도 거래량/잔고 (티커 인덱스, 시장 컬럼 포함)"""
+        if date is None:
+            date = datetime.now(KST)
+
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+
+        date_str = date.strftime('%Y%m%d')
+        datasets = {
+            'short_volume': ('get_shorting_volume_by_ticker', SHORT_VOLUME_COLUMNS),
+            'short_balance': ('get_shorting_balance_by_ticker', SHORT_BALANCE_COLUMNS)
+        }
+
+        # 저장소에 없는 (데이터셋, 시장)만 동시에 수집
+        frames: Dict[tuple, pd.DataFrame] = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {}
+            for name, (func_name, columns) in datasets.items():
+                for market in SHORT_MARKETS:
+                    cached = self.store.read(date_str, f"{name}_{market}")
+                    if cached is not None:
+                        frames[(name, market)] = cached
+                    else:
+                        futures[(name, market)] = executor.submit(self._fetch, date_str, market, func_name, columns)
+
+            for (name, market), future in futures.items():
+                try:
+                    frame = future.result()
+                except Exception as e:
+                    logger.warning(f"{market} 공매도 데이터 수집 실패 ({name}): {e}")
+                    continue
+                frames[(name, market)] = frame
+                self.store.write(date_str, f"{name}_{market}", frame)
+
+        markets = []
+        for market in SHORT_MARKETS:
+            volume = frames.get(('short_volume', market))
+            if volume is None or volume.empty:
+                continue
+            balance = frames.get(('short_balance', market), pd.DataFrame())
+            # 잔고는 공시 지연으로 비어 있을 수 있음
+            merged = volume.join(balance.reindex(columns=list(SHORT_BALANCE_COLUMNS.values())), how='left')
+            merged['market'] = market
+            markets.append(merged)
+
+        if not markets:
+            logger.error(f"공매도 데이터 수집 실패: {date_str}")
+            return pd.DataFrame(columns=list(SHORT_VOLUME_COLUMNS.values()) +
+                                list(SHORT_BALANCE_COLUMNS.values()) + ['market'])
+
+        result = pd.concat(markets)
+        logger.info(f"공매도 데이터 수집 완료: {date_str} ({len(result)}개 종목)")
+        return result
+
+    def _fetch(self, date_str: str, market: str, func_name: str, columns: Dict[str, str]) -> pd.DataFrame:
+        data = self.source.pykrx(func_name, date_str, market)
+        data = data.rename(columns=columns).reindex(columns=list(columns.values()))
+        data.index = data.index.astype(str)
+        data.index.name = '티커'
+        return data
@@ -1,19 +1,56 @@
-import yfinance as yf
-import pykrx.stock as pykrx_stock
-from pykrx import stock
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day
+from ..utils.trading_calendar import get_trading_calendar
+from .market_snapshot import MarketSnapshot, MarketSnapshotCache
+from .market_store import MarketDataStore
+from .ticker_master import TickerMaster
+from .index_master import IndexMaster
+from ..data_source.data_source import DataSource, get_default_source
+from ..data_source.fetch_engine import FetchEngine, FetchError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class StockDataCollector:
-    def __init__(self):
+    # KRX 지수 코드
+    INDEX_CODES = {
+        'kospi': '1001',
+        'kosdaq': '2001',
+        'kospi200': '1028'
+    }
+    MAX_INDEX_WORKERS = 4
+    # 업종 지수 누적 등락률 기간 (거래일)
+    SECTOR_TREND_DAYS = 5
+    
+    def __init__(self, store: MarketDataStore = None, source: DataSource = None,
+                 fetch_engine: FetchEngine = None):
         self.kospi_ticker = "^KS11"
         self.kosdaq_ticker = "^KQ11"
+        # pykrx/yfinance 호출은 데이터 소스를 통해 수행 (기록/재생 가능)
+        self.source = source if source is not None else get_default_source()
+        # 소스별 속도 제한/재시도/헤지 요청
+        self.fetch_engine = fetch_engine if fetch_engine is not None else FetchEngine()
+        # 로컬 저장소에 있는 거래일은 KRX를 호출하지 않음
+        self.store = store if store is not None else MarketDataStore()
+        # 배치마다 전종목 시세를 다시 받지 않도록 (date, market)별 스냅샷 공유
+        self.snapshots = MarketSnapshotCache(store=self.store, source=self.source)
+        # 종목명/시장/업종은 거래일별 마스터 테이블에서 조회
+        self.ticker_master = TickerMaster(source=self.source)
+        # 지수 코드 → 지수명은 거래일별 지수 마스터에서 조회
+        self.index_master = IndexMaster(source=self.source)
+    
+    def get_market_snapshot(self, date: datetime = None, market: str = "ALL") -> MarketSnapshot:
+        if date is None:
+            date = datetime.now(KST)
+            
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+        
+        return self.snapshots.get(date.strftime('%Y%m%d'), market)
     
     def get_index_data(self, date: datetime = None) -> Dict:
         if date is None:
@@ -26,94 +63,175 @@ class StockDataCollector:
         previous_date = get_previous_trading_day(date)
         previous_date_str = previous_date.strftime('%Y%m%d')
         
+        # KRX를 우선 사용하고, 지연/실패 시 yfinance를 헤지 요청으로 동시에 시도
         try:
-            # KOSPI 데이터
-            kospi_data = stock.get_index_ohlcv(date_str, date_str, "1001")
-            kospi_prev = stock.get_index_ohlcv(previous_date_str, previous_date_str, "1001")
-            
-            # KOSDAQ 데이터  
-            kosdaq_data = stock.get_index_ohlcv(date_str, date_str, "2001")
-            kosdaq_prev = stock.get_index_ohlcv(previous_date_str, previous_date_str, "2001")
-            
-            result = {
+            fetched = self.fetch_engine.fetch([
+                ('krx', lambda: self._get_krx_index_data(date, date_str, previous_date_str)),
+                ('yfinance', lambda: self._get_yfinance_index_data(date))
+            ])
+        except FetchError as e:
+            logger.error(f"지수 데이터 수집 실패: {e} {e.errors}")
+            return {
                 'date': date.strftime('%Y-%m-%d'),
-                'kospi': {
-                    'current': float(kospi_data['종가'].iloc[0]) if not kospi_data.empty else 0,
-                    'previous': float(kospi_prev['종가'].iloc[0]) if not kospi_prev.empty else 0,
-                    'change_rate': 0
-                },
-                'kosdaq': {
-                    'current': float(kosdaq_data['종가'].iloc[0]) if not kosdaq_data.empty else 0,
-                    'previous': float(kosdaq_prev['종가'].iloc[0]) if not kosdaq_prev.empty else 0,
-                    'change_rate': 0
-                }
+                'kospi': {'current': 0, 'previous': 0, 'change_rate': 0},
+                'kosdaq': {'current': 0, 'previous': 0, 'change_rate': 0},
+                'source': None
             }
+        
+        result = fetched.value
+        result['source'] = fetched.source
+        logger.info(f"지수 데이터 수집 완료 ({fetched.source}, {fetched.elapsed:.1f}초): "
+                    f"KOSPI {result['kospi']['current']:.2f}, KOSDAQ {result['kosdaq']['current']:.2f}")
+        return result
+    
+    def _get_krx_index_data(self, date: datetime, date_str: str, previous_date_str: str) -> Dict:
+        closes = self.get_index_closes([self.INDEX_CODES['kospi'], self.INDEX_CODES['kosdaq']], date)
+        
+        kospi = closes.get(self.INDEX_CODES['kospi'])
+        kosdaq = closes.get(self.INDEX_CODES['kosdaq'])
+        if kospi is None or kosdaq is None:
+            raise ValueError(f"KRX 지수 데이터 없음: {date_str}")
+        
+        return {
+            'date': date.strftime('%Y-%m-%d'),
+            'kospi': kospi,
+            'kosdaq': kosdaq
+        }
+    
+    def get_index_closes(self, index_codes: List[str], date: datetime = None) -> Dict[str, Dict]:
+        """지수 코드별 당일/전일 종가와 등락률
+        
+        코드마다 전일~당일 기간을 한 번에 조회하고 여러 코드는 동시에 조회한다.
+        KOSPI200(1028), 업종 지수 등 임의의 KRX 지수 코드를 사용할 수 있다.
+        수집에 실패한 코드는 결과에서 제외된다.
+        """
+        if date is None:
+            date = datetime.now(KST)
             
-            # 등락률 계산
-            if result['kospi']['previous'] > 0:
-                result['kospi']['change_rate'] = ((result['kospi']['current'] - result['kospi']['previous']) / result['kospi']['previous']) * 100
-            
-            if result['kosdaq']['previous'] > 0:
-                result['kosdaq']['change_rate'] = ((result['kosdaq']['current'] - result['kosdaq']['previous']) / result['kosdaq']['previous']) * 100
-            
-            logger.info(f"지수 데이터 수집 완료: KOSPI {result['kospi']['current']:.2f}, KOSDAQ {result['kosdaq']['current']:.2f}")
-            return result
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+        
+        date_str = date.strftime('%Y%m%d')
+        previous_date_str = get_previous_trading_day(date).strftime('%Y%m%d')
+        
+        if not index_codes:
+            return {}
+        
+        def collect(index_code: str) -> Optional[Dict]:
+            try:
+                data = self._get_index_range(index_code, previous_date_str, date_str)
+                return self._index_close_entry(data, date_str)
+            except Exception as e:
+                logger.warning(f"지수 데이터 수집 실패 ({index_code}): {e}")
+                return None
+        
+        workers = min(len(index_codes), self.MAX_INDEX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            entries = dict(zip(index_codes, executor.map(collect, index_codes)))
+        
+        return {code: entry for code, entry in entries.items() if entry is not None}
+    
+    def _get_index_range(self, index_code: str, from_str: str, to_str: str) -> pd.DataFrame:
+        """전일~당일 지수 시세 (저장소에 두 날짜가 모두 있으면 KRX 호출 없음)"""
+        name = f"index_{index_code}"
+        cached = [self.store.read(day_str, name) for day_str in (from_str, to_str)]
+        if all(frame is not None and not frame.empty for frame in cached):
+            return pd.concat(cached)
+        
+        # 코드별 동시 조회이므로 KRX 호출마다 속도 제한 토큰 차감
+        self.fetch_engine.throttle('krx')
+        data = self.source.pykrx('get_index_ohlcv', from_str, to_str, index_code)
+        for day in data.index:
+            self.store.write(day.strftime('%Y%m%d'), name, data.loc[[day]])
+        return data
+    
+    @staticmethod
+    def _index_close_entry(data: pd.DataFrame, date_str: str) -> Dict:
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        data = data[data.index <= pd.Timestamp(date_str)]
+        if len(data) < 2 or data.index[-1].strftime('%Y%m%d') != date_str:
+            raise ValueError(f"지수 시세 부족: {date_str}")
+        
+        current = float(data['종가'].iloc[-1])
+        previous = float(data['종가'].iloc[-2])
+        change_rate = ((current - previous) / previous) * 100 if previous > 0 else 0
+        
+        return {'current': current, 'previous': previous, 'change_rate': change_rate}
+    
+    def prefetch_index_range(self, start: datetime, end: datetime, index_codes: List[str] = None) -> int:
+        """기간 지수 시세를 지수별 1회 조회해 거래일별로 저장소에 기록"""
+        if index_codes is None:
+            index_codes = [self.INDEX_CODES['kospi'], self.INDEX_CODES['kosdaq']]
+        
+        from_str = start.strftime('%Y%m%d')
+        to_str = end.strftime('%Y%m%d')
+        stored = 0
+        
+        for index_code in index_codes:
+            name = f"index_{index_code}"
+            try:
+                self.fetch_engine.throttle('krx')
+                data = self.source.pykrx('get_index_ohlcv', from_str, to_str, index_code)
+            except Exception as e:
+                logger.warning(f"지수 기간 데이터 수집 실패 ({index_code}): {e}")
+                continue
             
-        except Exception as e:
-            logger.error(f"지수 데이터 수집 실패: {e}")
-            return self._get_fallback_index_data(date)
+            for day in data.index:
+                day_str = day.strftime('%Y%m%d')
+                if not self.store.has(day_str, name) and self.store.write(day_str, name, data.loc[[day]]):
+                    stored += 1
+        
+        logger.info(f"지수 기간 데이터 사전 수집 완료: {from_str}~{to_str} ({stored}건 저장)")
+        return stored
     
-    def _get_fallback_index_data(self, date: datetime) -> Dict:
-        try:
-            # yfinance를 이용한 대체 데이터 수집
-            kospi = yf.Ticker(self.kospi_ticker)
-            kosdaq = yf.Ticker(self.kosdaq_ticker)
-            
-            # 2일치 데이터 가져오기
-            end_date = date + timedelta(days=1)
-            start_date = date - timedelta(days=5)  # 주말 고려하여 여유있게
-            
-            kospi_hist = kospi.history(start=start_date, end=end_date)
-            kosdaq_hist = kosdaq.history(start=start_date, end=end_date)
-            
-            if len(kospi_hist) >= 2 and len(kosdaq_hist) >= 2:
-                kospi_current = kospi_hist['Close'].iloc[-1]
-                kospi_previous = kospi_hist['Close'].iloc[-2]
-                kosdaq_current = kosdaq_hist['Close'].iloc[-1]
-                kosdaq_previous = kosdaq_hist['Close'].iloc[-2]
-                
-                return {
-                    'date': date.strftime('%Y-%m-%d'),
-                    'kospi': {
-                        'current': float(kospi_current),
-                        'previous': float(kospi_previous),
-                        'change_rate': ((kospi_current - kospi_previous) / kospi_previous) * 100
-                    },
-                    'kosdaq': {
-                        'current': float(kosdaq_current),
-                        'previous': float(kosdaq_previous),
-                        'change_rate': ((kosdaq_current - kosdaq_previous) / kosdaq_previous) * 100
-                    }
-                }
-        except Exception as e:
-            logger.error(f"대체 지수 데이터 수집도 실패: {e}")
+    def _get_yfinance_index_data(self, date: datetime) -> Dict:
+        # yfinance를 이용한 대체 데이터 수집
+        # 2일치 데이터 가져오기
+        end_date = date + timedelta(days=1)
+        start_date = date - timedelta(days=5)  # 주말 고려하여 여유있게
+        
+        self.fetch_engine.throttle('yfinance')
+        kospi_hist = self.source.yfinance_history(self.kospi_ticker, start=start_date, end=end_date)
+        self.fetch_engine.throttle('yfinance')
+        kosdaq_hist = self.source.yfinance_history(self.kosdaq_ticker, start=start_date, end=end_date)
+        
+        if len(kospi_hist) < 2 or len(kosdaq_hist) < 2:
+            raise ValueError(f"yfinance 지수 데이터 부족: {date.strftime('%Y-%m-%d')}")
+        
+        kospi_current = kospi_hist['Close'].iloc[-1]
+        kospi_previous = kospi_hist['Close'].iloc[-2]
+        kosdaq_current = kosdaq_hist['Close'].iloc[-1]
+        kosdaq_previous = kosdaq_hist['Close'].iloc[-2]
         
         return {
             'date': date.strftime('%Y-%m-%d'),
-            'kospi': {'current': 0, 'previous': 0, 'change_rate': 0},
-            'kosdaq': {'current': 0, 'previous': 0, 'change_rate': 0}
+            'kospi': {
+                'current': float(kospi_current),
+                'previous': float(kospi_previous),
+                'change_rate': ((kospi_current - kospi_previous) / kospi_previous) * 100
+            },
+            'kosdaq': {
+                'current': float(kosdaq_current),
+                'previous': float(kosdaq_previous),
+                'change_rate': ((kosdaq_current - kosdaq_previous) / kosdaq_previous) * 100
+            }
         }
     
-    def get_stock_list(self, market: str = "ALL") -> List[str]:
+    def get_stock_list(self, market: str = "ALL", date: datetime = None) -> List[str]:
         try:
-            if market == "KOSPI":
-                tickers = stock.get_market_ticker_list(market="KOSPI")
-            elif market == "KOSDAQ":
-                tickers = stock.get_market_ticker_list(market="KOSDAQ")
-            else:
-                kospi_tickers = stock.get_market_ticker_list(market="KOSPI")
-                kosdaq_tickers = stock.get_market_ticker_list(market="KOSDAQ")
-                tickers = kospi_tickers + kosdaq_tickers
+            self.ticker_master.ensure(date)
+            tickers = self.ticker_master.get_tickers(market)
+            
+            if not tickers:
+                # 마스터 생성 실패 시 시장별 티커 목록 직접 조회
+                if market == "KOSPI":
+                    tickers = self.source.pykrx('get_market_ticker_list', market="KOSPI")
+                elif market == "KOSDAQ":
+                    tickers = self.source.pykrx('get_market_ticker_list', market="KOSDAQ")
+                else:
+                    kospi_tickers = self.source.pykrx('get_market_ticker_list', market="KOSPI")
+                    kosdaq_tickers = self.source.pykrx('get_market_ticker_list', market="KOSDAQ")
+                    tickers = kospi_tickers + kosdaq_tickers
             
             logger.info(f"{market} 종목 리스트 수집 완료: {len(tickers)}개")
             return tickers
@@ -133,46 +251,22 @@ class StockDataCollector:
         previous_date_str = previous_date.strftime('%Y%m%d')
         
         try:
-            # 당일 주가 데이터
-            current_data = stock.get_market_ohlcv(date_str, market="ALL")
-            # 전일 주가 데이터
-            previous_data = stock.get_market_ohlcv(previous_date_str, market="ALL")
-            
-            # 종목명 정보
-            stock_names = {}
-            for ticker in tickers:
-                try:
-                    name = stock.get_market_ticker_name(ticker)
-                    stock_names[ticker] = name
-                except:
-                    stock_names[ticker] = ticker
-            
-            # 데이터 병합 및 계산
-            result_data = []
-            for ticker in tickers:
-                try:
-                    current_price = current_data.loc[ticker, '종가'] if ticker in current_data.index else 0
-                    previous_price = previous_data.loc[ticker, '종가'] if ticker in previous_data.index else 0
-                    volume = current_data.loc[ticker, '거래량'] if ticker in current_data.index else 0
-                    
-                    if previous_price > 0:
-                        change_rate = ((current_price - previous_price) / previous_price) * 100
-                    else:
-                        change_rate = 0
-                    
-                    result_data.append({
-                        'ticker': ticker,
-                        'name': stock_names.get(ticker, ticker),
-                        'current_price': current_price,
-                        'previous_price': previous_price,
-                        'change_rate': change_rate,
-                        'volume': volume
-                    })
-                except Exception as e:
-                    logger.warning(f"종목 {ticker} 데이터 처리 실패: {e}")
-                    continue
-            
-            df = pd.DataFrame(result_data)
+            # 당일 주가 데이터 (스냅샷 공유)
+            snapshot = self.snapshots.get(date_str, "ALL")
+            current_data = snapshot.ohlcv
+            
+            # 전일 종가: 등락률로 역산 가능하면 전일 전종목 시세는 받지 않음
+            if snapshot.has_change_rate:
+                previous_close = snapshot.previous_close()
+            else:
+                previous_close = self.snapshots.get(previous_date_str, "ALL").close()
+            
+            # 종목명 정보 (마스터 테이블 조회)
+            self.ticker_master.ensure(date)
+            stock_names = self.ticker_master.get_names()
+            
+            # 데이터 병합 및 계산 (요청 티커 기준으로 한 번에 정렬/결합)
+            df = self._assemble_stock_frame(tickers, snapshot, previous_close, stock_names)
             logger.info(f"주식 데이터 수집 완료: {len(df)}개 종목")
             return df
             
@@ -180,27 +274,91 @@ class StockDataCollector:
             logger.error(f"주식 데이터 수집 실패: {e}")
             return pd.DataFrame()
     
+    def _assemble_stock_frame(self, tickers: List[str], snapshot: MarketSnapshot,
+                              previous_close: pd.Series, stock_names: Dict[str, str]) -> pd.DataFrame:
+        columns = ['ticker', 'name', 'current_price', 'previous_price', 'change_rate', 'volume']
+        current_data = snapshot.ohlcv
+        if current_data.empty:
+            return pd.DataFrame(columns=columns)
+        
+        index = pd.Index(tickers, name='ticker')
+        prices = current_data[['종가', '거래량']].join(
+            previous_close.rename('previous_price'), how='left'
+        ).reindex(index)
+        
+        current_price = prices['종가'].fillna(0).astype('int64')
+        previous_price = prices['previous_price'].fillna(0)
+        
+        if snapshot.has_change_rate:
+            change_rate = current_data['등락률'].reindex(index).astype(float)
+        else:
+            change_rate = (current_price - previous_price) / previous_price.where(previous_price > 0) * 100
+        
+        return pd.DataFrame({
+            'ticker': tickers,
+            'name': index.map(lambda ticker: stock_names.get(ticker, ticker)),
+            'current_price': current_price.to_numpy(),
+            'previous_price': previous_price.to_numpy(),
+            'change_rate': change_rate.fillna(0).to_numpy(),
+            'volume': prices['거래량'].fillna(0).astype('int64').to_numpy()
+        }, columns=columns)
+    
     def get_sector_data(self, date: datetime = None) -> Dict:
         if date is None:
             date = datetime.now(KST)
             
-        date_str = date.strftime('%Y%m%d')
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
         
         try:
-            # 업종별 지수 데이터
-            sector_data = stock.get_index_ohlcv_by_date(date_str, date_str)
+            # 업종별 지수 데이터 (시장별 1회 벌크 조회, 지수명은 지수 마스터에서 조회)
+            self.index_master.ensure(date)
+            trend_dates = [day.strftime('%Y%m%d')
+                           for day in get_trading_calendar().recent(date, self.SECTOR_TREND_DAYS)]
             
             sectors = {}
-            for idx, row in sector_data.iterrows():
-                sector_name = stock.get_index_ticker_name(str(idx))
-                sectors[sector_name] = {
-                    'close': row['종가'],
-                    'change': row['등락률']
-                }
+            for market in self.index_master.MARKETS:
+                sector_data = self.get_sector_frame(date, market)
+                # 저장소에 쌓인 최근 거래일 등락률로 누적 등락률 계산 (기간이 다 차지 않으면 None)
+                history = self.get_sector_history(trend_dates, market)
+                if len(history) == self.SECTOR_TREND_DAYS:
+                    trend = ((1 + history.astype(float) / 100).prod() - 1) * 100
+                else:
+                    trend = pd.Series(dtype=float)
+                
+                for sector_name, close, change in zip(sector_data.index, sector_data['종가'], sector_data['등락률']):
+                    key = sector_name if sector_name not in sectors else f"{market} {sector_name}"
+                    change_period = trend.get(sector_name)
+                    sectors[key] = {
+                        'close': float(close),
+                        'change': round(float(change), 2),
+                        'change_period': None if change_period is None or pd.isna(change_period)
+                                         else round(float(change_period), 2),
+                        'market': market,
+                        'code': self.index_master.get_code(sector_name, market)
+                    }
             
             logger.info(f"섹터 데이터 수집 완료: {len(sectors)}개 섹터")
             return sectors
             
         except Exception as e:
             logger.error(f"섹터 데이터 수집 실패: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    def get_sector_frame(self, date: datetime, market: str = "KOSPI") -> pd.DataFrame:
+        """시장별 전 업종 지수의 종가/등락률 프레임 (지수명 인덱스, 저장소 read-through)"""
+        date_str = date.strftime('%Y%m%d')
+        name = f"sector_{market}"
+        
+        cached = self.store.read(date_str, name)
+        if cached is not None:
+            return cached
+        
+        self.fetch_engine.throttle('krx')
+        data = self.source.pykrx('get_index_price_change', date_str, date_str, market)
+        self.store.write(date_str, name, data)
+        return data
+    
+    def get_sector_history(self, dates: List[str], market: str = "KOSPI", column: str = '등락률') -> pd.DataFrame:
+        """저장소에 쌓인 업종 지수로 (날짜 × 업종) 패널 조회 (섹터 로테이션 분석용)"""
+        return self.store.read_panel(dates, f"sector_{market}", column)
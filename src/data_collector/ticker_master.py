@@ -0,0 +1,174 @@
+"""
+종목 마스터 테이블
+거래일마다 벌크 조회로 (티커, 종목명, 시장, 상장일, 업종) 테이블을 한 번 만들어
+로컬에 저장하고, 종목명/업종 조회는 메모리 딕셔너리로 처리한다.
+"""
+
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+import glob
+import logging
+import os
+import threading
+from ..utils.market_utils import KST, get_previous_trading_day, is_trading_day
+from ..data_source.data_source import DataSource, get_default_source
+
+logger = logging.getLogger(__name__)
+
+class TickerMaster:
+    COLUMNS = ['ticker', 'name', 'market', 'listing_date', 'sector']
+    MARKETS = ['KOSPI', 'KOSDAQ']
+
+    def __init__(self, data_dir: str = "data/ticker_master", source: DataSource = None):
+        self.data_dir = data_dir
+        self.source = source if source is not None else get_default_source()
+        self.date_str: Optional[str] = None
+        self.table = pd.DataFrame(columns=self.COLUMNS)
+        self._names: Dict[str, str] = {}
+        self._sectors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, date: datetime = None) -> pd.DataFrame:
+        """해당 거래일의 마스터를 메모리에 준비 (로컬 파일 → 벌크 수집 순)"""
+        if date is None:
+            date = datetime.now(KST)
+
+        if not is_trading_day(date):
+            date = get_previous_trading_day(date)
+
+        date_str = date.strftime('%Y%m%d')
+
+        with self._lock:
+            if self.date_str == date_str and not self.table.empty:
+                return self.table
+
+            table = self._load(date_str)
+            if table is None:
+                table = self._build(date_str)
+                if not table.empty:
+                    self._save(date_str, table)
+
+            if not table.empty:
+                self._set_table(date_str, table)
+            elif self.table.empty:
+                # 수집 실패 시 가장 최근에 저장된 마스터로 대체
+                latest = self._load_latest()
+                if latest is not None:
+                    self._set_table(*latest)
+
+            return self.table
+
+    def get_name(self, ticker: str, default: Optional[str] = None) -> Optional[str]:
+        self._ensure_loaded()
+        return self._names.get(ticker, default)
+
+    def get_names(self) -> Dict[str, str]:
+        self._ensure_loaded()
+        return self._names
+
+    def get_sector(self, ticker: str, default: Optional[str] = None) -> Optional[str]:
+        self._ensure_loaded()
+        return self._sectors.get(ticker, default)
+
+    def get_tickers(self, market: str = "ALL") -> List[str]:
+        self._ensure_loaded()
+        if self.table.empty:
+            return []
+        if market == "ALL":
+            return self.table['ticker'].tolist()
+        return self.table.loc[self.table['market'] == market, 'ticker'].tolist()
+
+    def _ensure_loaded(self):
+        if not self.table.empty:
+            return
+        with self._lock:
+            if not self.table.empty:
+                return
+            latest = self._load_latest()
+            if latest is not None:
+                self._set_table(*latest)
+                return
+        self.ensure()
+
+    def _set_table(self, date_str: str, table: pd.DataFrame):
+        self.date_str = date_str
+        self.table = table
+        self._names = dict(zip(table['ticker'], table['name']))
+        sectors = table.dropna(subset=['sector'])
+        self._sectors = dict(zip(sectors['ticker'], sectors['sector']))
+
+    def _build(self, date_str: str) -> pd.DataFrame:
+        frames = []
+        for market in self.MARKETS:
+            try:
+                names = self.source.krx('get_market_ticker_and_name', date_str, market)
+                if len(names) == 0:
+                    continue
+                frames.append(pd.DataFrame({
+                    'ticker': names.index.astype(str),
+                    'name': names.values,
+                    'market': market
+                }))
+            except Exception as e:
+                logger.error(f"{market} 종목 마스터 수집 실패: {e}")
+
+        if not frames:
+            return pd.DataFrame(columns=self.COLUMNS)
+
+        table = pd.concat(frames, ignore_index=True).drop_duplicates('ticker')
+        table['listing_date'] = table['ticker'].map(self._fetch_listing_dates())
+        table['sector'] = table['ticker'].map(self._fetch_sectors(date_str))
+
+        logger.info(f"종목 마스터 생성 완료: {date_str} ({len(table)}개 종목)")
+        return table[self.COLUMNS]
+
+    def _fetch_listing_dates(self) -> pd.Series:
+        try:
+            info = self.source.pykrx('get_market_ohlcv_by_market', "ALL")
+            return pd.to_datetime(info['상장일']).dt.strftime('%Y-%m-%d')
+        except Exception as e:
+            logger.warning(f"상장일 정보 수집 실패: {e}")
+            return pd.Series(dtype=object)
+
+    def _fetch_sectors(self, date_str: str) -> pd.Series:
+        sectors = []
+        for market in self.MARKETS:
+            try:
+                df = self.source.pykrx('get_market_sector_classifications', date_str, market)
+                if not df.empty:
+                    sectors.append(df['업종명'])
+            except Exception as e:
+                logger.warning(f"{market} 업종 분류 수집 실패: {e}")
+        if not sectors:
+            return pd.Series(dtype=object)
+        return pd.concat(sectors)
+
+    def _path(self, date_str: str) -> str:
+        return os.path.join(self.data_dir, f"ticker_master_{date_str}.csv")
+
+    def _load(self, date_str: str) -> Optional[pd.DataFrame]:
+        path = self._path(date_str)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_csv(path, dtype=str, encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"종목 마스터 파일 로드 실패 ({path}): {e}")
+            return None
+
+    def _load_latest(self):
+        paths = sorted(glob.glob(os.path.join(self.data_dir, "ticker_master_*.csv")))
+        for path in reversed(paths):
+            date_str = os.path.basename(path)[len("ticker_master_"):-len(".csv")]
+            table = self._load(date_str)
+            if table is not None and not table.empty:
+                return date_str, table
+        return None
+
+    def _save(self, date_str: str, table: pd.DataFrame):
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            table.to_csv(self._path(date_str), index=False, encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"종목 마스터 저장 실패: {e}")
@@ -0,0 +1,174 @@
+"""
+투자자 수급 누적 추적
+시장별/투자자별 일일 순매수(억원)를 최근 N거래일 링 버퍼로 보관하고,
+5/20/60일 누적 합계를 실행 상태로 저장한다.
+새 거래일이 들어오면 가장 최근 값을 더하고 창에서 빠지는 값을 빼서 O(1)로 갱신하므로
+KRX에서 N일치를 다시 조회할 필요가 없다.
+버퍼에 남아 있는 과거 거래일의 누적도 해당 날짜에서 끝나는 창으로 다시 합산해 조회할 수 있다.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import threading
+from ..data_collector.investor_labels import STANDARD_TYPES
+from ..utils.trading_calendar import get_trading_calendar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = [5, 20, 60]
+FLOW_MARKETS = ['kospi', 'kosdaq']
+
+class InvestorFlowTracker:
+    def __init__(self, state_path: Optional[str] = "data/flow_state/investor_flows.json",
+                 windows: List[int] = None, investors: List[str] = None):
+        self.state_path = state_path
+        self.windows = sorted(windows or DEFAULT_WINDOWS)
+        self.investors = list(investors or STANDARD_TYPES)
+        self.capacity = self.windows[-1]
+        self._lock = threading.Lock()
+        self.reset()
+        self._load()
+
+    def reset(self):
+        self.last_date: Optional[str] = None
+        self.dates: List[str] = []
+        # 시장별 링 버퍼 (capacity × 투자자)와 창별 누적 합계 (창 × 투자자)
+        self.head = 0
+        self.count = 0
+        self.history = {market: np.zeros((self.capacity, len(self.investors))) for market in FLOW_MARKETS}
+        self.sums = {market: np.zeros((len(self.windows), len(self.investors))) for market in FLOW_MARKETS}
+
+    def update(self, date_str: str, investor_data: Dict) -> bool:
+        """하루치 투자자 데이터(get_investor_trading_data 결과)를 반영. 이미 반영된 날짜면 False"""
+        with self._lock:
+            if self.last_date is not None and date_str <= self.last_date:
+                return False
+            if not all(investor_data.get(market) for market in FLOW_MARKETS):
+                logger.warning(f"투자자 데이터가 비어 있어 수급 누적을 갱신하지 않습니다: {date_str}")
+                return False
+
+            for market in FLOW_MARKETS:
+                values = np.array([investor_data[market].get(investor, 0.0) for investor in self.investors],
+                                  dtype=float)
+                history = self.history[market]
+                sums = self.sums[market]
+
+                for i, window in enumerate(self.windows):
+                    sums[i] += values
+                    # 창에서 빠지는 날 (window일 전 값) 차감
+                    if self.count >= window:
+                        sums[i] -= history[(self.head - window) % self.capacity]
+
+                history[self.head] = values
+
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            self.dates = (self.dates + [date_str])[-self.capacity:]
+            self.last_date = date_str
+            return True
+
+    def missing_dates(self, date_str: str) -> List[str]:
+        """마지막 반영일과 date_str 사이에 빠진 거래일 (최대 capacity일)"""
+        if self.last_date is None:
+            return []
+
+        calendar = get_trading_calendar()
+        start = calendar.next(self.last_date)
+        end = calendar.previous(date_str)
+        days = calendar.between(start, end)
+        return [day.strftime('%Y%m%d') for day in days[-self.capacity:]]
+
+    def summary(self, date_str: str = None) -> Optional[Dict]:
+        """리포트용 누적 수급 (date_str 생략 시 마지막 반영일, 버퍼에 없는 날짜면 None)"""
+        with self._lock:
+            if self.last_date is None:
+                return None
+            if date_str is None or date_str == self.last_date:
+                date_str, days, sums = self.last_date, self.count, self.sums
+            elif date_str in self.dates:
+                # 과거 거래일은 해당 날짜에서 끝나는 창으로 링 버퍼를 다시 합산
+                days = self.dates.index(date_str) + 1
+                end = self.head - (self.count - days)
+                sums = {market: self._window_sums(self.history[market], end, days) for market in FLOW_MARKETS}
+            else:
+                return None
+
+            markets = {}
+            for market in FLOW_MARKETS:
+                markets[market] = [
+                    {
+                        'investor': investor,
+                        'flows': {window: round(float(sums[market][i, j]), 1)
+                                  for i, window in enumerate(self.windows)}
+                    }
+                    for j, investor in enumerate(self.investors)
+                ]
+
+            return {
+                'date': date_str,
+                'days': days,
+                'windows': list(self.windows),
+                'available': {window: days >= window for window in self.windows},
+                'markets': markets
+            }
+
+    def save(self):
+        if self.state_path is None:
+            return
+
+        with self._lock:
+            state = {
+                'windows': self.windows,
+                'investors': self.investors,
+                'last_date': self.last_date,
+                'dates': self.dates,
+                'head': self.head,
+                'count': self.count,
+                'history': {market: self.history[market].tolist() for market in FLOW_MARKETS}
+            }
+
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.warning(f"수급 누적 상태 저장 실패: {e}")
+
+    def _load(self):
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+            if state.get('windows') != self.windows or state.get('investors') != self.investors:
+                logger.warning("수급 누적 상태의 창/투자자 구성이 달라 새로 시작합니다.")
+                return
+
+            self.last_date = state['last_date']
+            self.dates = state['dates']
+            self.head = state['head']
+            self.count = state['count']
+            for market in FLOW_MARKETS:
+                self.history[market] = np.array(state['history'][market], dtype=float)
+                # 저장된 합계 대신 링 버퍼로 다시 계산해 부동소수 오차가 누적되지 않게 함
+                self.sums[market] = self._window_sums(self.history[market], self.head, self.count)
+        except Exception as e:
+            logger.warning(f"수급 누적 상태 로드 실패, 새로 시작합니다: {e}")
+            self.reset()
+
+    def _window_sums(self, history: np.ndarray, end: int, days: int) -> np.ndarray:
+        """링 버퍼 위치 end 직전까지 쌓인 days일 중 창별 최근 합계"""
+        sums = np.zeros((len(self.windows), len(self.investors)))
+        for i, window in enumerate(self.windows):
+            n = min(window, days)
+            rows = [(end - k) % self.capacity for k in range(1, n + 1)]
+            if rows:
+                sums[i] = history[rows].sum(axis=0)
+        return sums
@@ -5,15 +5,20 @@ from typing import Dict, List, Tuple
 import logging
 from ..utils.market_utils import KST
 from ..utils.sector_classifier import SectorClassifier
+from ..utils.keyword_matcher import get_keyword_matcher
+from ..data_collector.ticker_master import TickerMaster
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class StockAnalyzer:
-    def __init__(self, surge_threshold: float = 5.0, plunge_threshold: float = -5.0):
+    def __init__(self, surge_threshold: float = 5.0, plunge_threshold: float = -5.0,
+                 ticker_master: TickerMaster = None):
         self.surge_threshold = surge_threshold
         self.plunge_threshold = plunge_threshold
         self.sector_classifier = SectorClassifier()
+        self.keyword_matcher = get_keyword_matcher()
+        self.ticker_master = ticker_master if ticker_master is not None else TickerMaster()
     
     def analyze_surge_stocks(self, stock_data: pd.DataFrame, max_count: int = 50) -> List[Dict]:
         if stock_data.empty:
@@ -77,6 +82,21 @@ class StockAnalyzer:
         logger.info(f"급락 종목 분석 완료: {len(result)}개 종목")
         return result
     
+    def attach_news_reasons(self, stocks: List[Dict], related_news: Dict[str, List[Dict]]) -> List[Dict]:
+        """종목 뉴스가 있으면 최신 헤드라인을 사유로 사용 (없으면 기존 추정 사유 유지)"""
+        attached = 0
+        for stock in stocks:
+            news = related_news.get(stock['ticker'])
+            if not news:
+                continue
+            stock['reason'] = news[0]['title']
+            stock['news_link'] = news[0]['link']
+            stock['news'] = news
+            attached += 1
+        
+        logger.info(f"종목 뉴스 연결 완료: {attached}/{len(stocks)}개 종목")
+        return stocks
+    
     def analyze_volume_surge_stocks(self, stock_data: pd.DataFrame, multiplier: float = 3.0) -> List[Dict]:
         if stock_data.empty:
             return []
@@ -100,6 +120,29 @@ class StockAnalyzer:
         logger.info(f"거래량 급증 종목 분석 완료: {len(result)}개 종목")
         return result
     
+    def analyze_top_net_buys(self, stock_data: pd.DataFrame, top_n: int = 10) -> Dict[str, List[Dict]]:
+        """외국인/기관 순매수 거래대금 상위 종목"""
+        result = {'foreign': [], 'institution': []}
+        if stock_data.empty:
+            return result
+        
+        for investor, column in [('foreign', 'foreign_net'), ('institution', 'institution_net')]:
+            if column not in stock_data.columns:
+                continue
+            
+            top_stocks = stock_data[stock_data[column] > 0].nlargest(top_n, column)
+            for _, row in top_stocks.iterrows():
+                result[investor].append({
+                    'ticker': row['ticker'],
+                    'name': row['name'],
+                    'net_buy': round(row[column] / 100000000, 1),  # 억원
+                    'current_price': int(row['current_price']),
+                    'change_rate': round(row['change_rate'], 2)
+                })
+        
+        logger.info(f"투자자 순매수 상위 분석 완료: 외국인 {len(result['foreign'])}개, 기관 {len(result['institution'])}개")
+        return result
+    
     def analyze_sector_performance(self, stock_data: pd.DataFrame) -> Dict:
         if stock_data.empty:
             return {}
@@ -137,6 +180,107 @@ class StockAnalyzer:
         logger.info(f"섹터 성과 분석 완료: {len(sorted_sectors)}개 섹터")
         return sorted_sectors
     
+    def analyze_heavy_short_selling(self, short_data: pd.DataFrame, stock_data: pd.DataFrame = None,
+                                    top_n: int = 10, min_volume: int = 100000) -> List[Dict]:
+        """공매도 거래 비중 상위 종목 (거래량이 적은 종목 제외)"""
+        if short_data is None or short_data.empty:
+            return []
+        
+        candidates = short_data[(short_data['total_volume'] >= min_volume) & (short_data['short_volume'] > 0)]
+        top_stocks = candidates.nlargest(top_n, 'short_volume_ratio')
+        
+        change_rates = pd.Series(dtype=float)
+        if stock_data is not None and not stock_data.empty:
+            change_rates = stock_data.set_index('ticker')['change_rate']
+        names = self.ticker_master.get_names()
+        
+        result = []
+        for ticker, row in top_stocks.iterrows():
+            balance_ratio = row.get('short_balance_ratio')
+            result.append({
+                'ticker': ticker,
+                'name': names.get(ticker, ticker),
+                'market': row['market'],
+                'short_volume': int(row['short_volume']),
+                'short_volume_ratio': round(float(row['short_volume_ratio']), 2),
+                'short_balance_ratio': None if pd.isna(balance_ratio) else round(float(balance_ratio), 2),
+                'change_rate': round(float(change_rates.get(ticker, 0.0)), 2)
+            })
+        
+        logger.info(f"공매도 비중 상위 분석 완료: {len(result)}개 종목")
+        return result
+    
+    def analyze_foreign_ownership(self, ownership: pd.DataFrame, top_n: int = 10, period: int = 5) -> List[Dict]:
+        """외국인 지분율 증가 상위 종목 (period 거래일 변화 기준)"""
+        column = f"foreign_ratio_chg_{period}d"
+        if ownership is None or ownership.empty or column not in ownership.columns:
+            return []
+        
+        top_stocks = ownership[ownership[column] > 0].nlargest(top_n, column)
+        names = self.ticker_master.get_names()
+        
+        def _round(value):
+            return None if pd.isna(value) else round(float(value), 2)
+        
+        result = []
+        for ticker, row in top_stocks.iterrows():
+            result.append({
+                'ticker': ticker,
+                'name': names.get(ticker, ticker),
+                'market': row['market'],
+                'foreign_ratio': _round(row['foreign_ratio']),
+                'change_1d': _round(row.get('foreign_ratio_chg_1d')),
+                'change_period': _round(row[column]),
+                'exhaustion_rate': _round(row['exhaustion_rate'])
+            })
+        
+        logger.info(f"외국인 지분율 증가 상위 분석 완료: {len(result)}개 종목")
+        return result
+    
+    def analyze_sector_indices(self, sector_data: Dict, top_n: int = 5) -> Dict[str, List[Dict]]:
+        """업종 지수 등락률 상위/하위 (KRX 업종 지수 기준)"""
+        if not sector_data:
+            return {'leaders': [], 'laggards': []}
+        
+        sectors = [{'sector': name, **values} for name, values in sector_data.items()]
+        ranked = sorted(sectors, key=lambda sector: sector['change'], reverse=True)
+        leaders = [sector for sector in ranked[:top_n] if sector['change'] > 0]
+        laggards = [sector for sector in ranked[::-1][:top_n] if sector['change'] < 0]
+        
+        logger.info(f"업종 지수 분석 완료: 상승 상위 {len(leaders)}개, 하락 상위 {len(laggards)}개")
+        return {'leaders': leaders, 'laggards': laggards}
+    
+    def analyze_sector_flows(self, stock_data: pd.DataFrame) -> Dict[str, List[Dict]]:
+        """상세 섹터/메가 섹터별 외국인·기관·개인 순매수 합계 (억원)"""
+        flow_columns = ['foreign_net', 'institution_net', 'individual_net']
+        result = {'sectors': [], 'mega_sectors': []}
+        if stock_data.empty or not all(column in stock_data.columns for column in flow_columns):
+            return result
+        
+        flows = stock_data[flow_columns].astype(float) / 100000000
+        flows['sector'] = self._classify_sectors(stock_data)
+        flows['mega_sector'] = flows['sector'].map(self.sector_classifier.get_mega_sector)
+        
+        for key, group_column in [('sectors', 'sector'), ('mega_sectors', 'mega_sector')]:
+            grouped = flows.groupby(group_column).agg(
+                stock_count=('foreign_net', 'size'),
+                foreign_net=('foreign_net', 'sum'),
+                institution_net=('institution_net', 'sum'),
+                individual_net=('individual_net', 'sum')
+            )
+            grouped['smart_money_net'] = grouped['foreign_net'] + grouped['institution_net']
+            grouped = grouped.sort_values('smart_money_net', ascending=False).round(1)
+            grouped.index.name = 'sector'
+            result[key] = grouped.reset_index().to_dict('records')
+        
+        logger.info(f"섹터별 수급 분석 완료: {len(result['sectors'])}개 섹터, {len(result['mega_sectors'])}개 메가 섹터")
+        return result
+    
+    def _classify_sectors(self, stock_data: pd.DataFrame) -> pd.Series:
+        """종목 마스터 종목명 기준 섹터 분류 (종목별 결과는 분류기에서 메모)"""
+        names = stock_data['ticker'].map(self.ticker_master.get_names()).fillna(stock_data['ticker'])
+        return self.sector_classifier.classify_many(stock_data['ticker'], names)
+    
     def identify_themes(self, surge_stocks: List[Dict], news_keywords: List[str] = None) -> List[Dict]:
         if not surge_stocks:
             return []
@@ -150,25 +294,13 @@ class StockAnalyzer:
                 sector_groups[sector] = []
             sector_groups[sector].append(stock)
         
-        # 추가 테마 키워드 (뉴스 기반)
-        special_themes = {
-            'AI/ChatGPT': ['AI', '인공지능', 'ChatGPT', '챗GPT', '생성AI'],
-            'K-컬처': ['한류', 'BTS', 'K-POP', '웹툰', 'OTT'],
-            '메타버스': ['메타버스', 'VR', 'AR', '가상현실'],
-            '수소경제': ['수소', '연료전지', '그린수소'],
-            '우주항공': ['우주', '위성', '발사체', '항공우주'],
-            '탄소중립': ['ESG', '친환경', '태양광', '풍력'],
-            '국방': ['방산', '국방', '무기', '방위산업']
-        }
+        # 특별 테마 식별 (종목명을 한 번만 훑어 해당하는 테마를 모두 찾음)
+        special_groups = {theme_name: [] for theme_name in self.keyword_matcher.theme_keywords}
+        for stock in surge_stocks:
+            for theme_name in self.keyword_matcher.scan(stock['name']).themes:
+                special_groups[theme_name].append(stock)
         
-        # 특별 테마 식별
-        for theme_name, keywords in special_themes.items():
-            matching_stocks = []
-            for stock in surge_stocks:
-                stock_name = stock['name']
-                if any(keyword in stock_name for keyword in keywords):
-                    matching_stocks.append(stock)
-            
+        for theme_name, matching_stocks in special_groups.items():
             if matching_stocks:
                 sector_groups[theme_name] = matching_stocks
         
@@ -209,9 +341,8 @@ class StockAnalyzer:
     
     def _get_sector_info(self, ticker: str) -> str:
         try:
-            # pykrx를 사용해 종목명 가져오기
-            from pykrx import stock
-            company_name = stock.get_market_ticker_name(ticker)
+            # 종목 마스터에서 종목명 가져오기
+            company_name = self.ticker_master.get_name(ticker, ticker)
             
             # 고도화된 섹터 분류기 사용
             sector = self.sector_classifier.classify_sector(ticker, company_name)
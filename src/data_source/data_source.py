@@ -0,0 +1,222 @@
+"""
+외부 데이터 호출 계층
+수집기(StockDataCollector, InvestorDataCollector, NewsCrawler)는 pykrx, yfinance, requests를
+직접 호출하지 않고 DataSource를 통해 호출한다.
+
+- LiveDataSource: 실제 네트워크 호출
+- RecordingDataSource: 실제 응답을 gzip 피클 픽스처로 기록
+- ReplayDataSource: 기록된 응답을 (설정한 지연과 함께) 재생하여 네트워크 없이 파이프라인 실행
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Union
+import atexit
+import gzip
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# requests 세션 연결 풀: 호스트 풀 개수, 호스트별 keep-alive 연결 수
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 8
+
+class DataSourceError(Exception):
+    """기록된 호출 실패를 재생하거나 재생할 응답이 없을 때 발생"""
+
+
+class HttpResponse:
+    """requests.Response에서 기록/재생에 필요한 부분만 담은 응답"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 encoding: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise DataSourceError(f"HTTP {self.status_code}: {self.url}")
+
+
+class DataSource:
+    """외부 호출 인터페이스. 하위 클래스는 call()만 구현한다."""
+
+    def call(self, namespace: str, func_name: str, *args, **kwargs) -> Any:
+        raise NotImplementedError
+
+    def pykrx(self, func_name: str, *args, **kwargs) -> Any:
+        """pykrx.stock API 호출"""
+        return self.call('pykrx', func_name, *args, **kwargs)
+
+    def krx(self, func_name: str, *args, **kwargs) -> Any:
+        """pykrx.website.krx 저수준 API 호출"""
+        return self.call('krx', func_name, *args, **kwargs)
+
+    def yfinance_history(self, symbol: str, **kwargs) -> Any:
+        return self.call('yfinance', 'history', symbol, **kwargs)
+
+    def http_get(self, url: str, **kwargs) -> HttpResponse:
+        return self.call('http', 'get', url, **kwargs)
+
+
+class LiveDataSource(DataSource):
+    def __init__(self):
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        """호스트별 연결 풀을 가진 세션 (요청마다 TCP/TLS 연결을 새로 맺지 않음)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def call(self, namespace: str, func_name: str, *args, **kwargs) -> Any:
+        if namespace == 'pykrx':
+            from pykrx import stock
+            return getattr(stock, func_name)(*args, **kwargs)
+
+        if namespace == 'krx':
+            from pykrx.website import krx
+            return getattr(krx, func_name)(*args, **kwargs)
+
+        if namespace == 'yfinance':
+            import yfinance as yf
+            symbol, *rest = args
+            return getattr(yf.Ticker(symbol), func_name)(*rest, **kwargs)
+
+        if namespace == 'http':
+            response = getattr(self._get_session(), func_name)(*args, **kwargs)
+            return HttpResponse(
+                url=response.url,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                content=response.content,
+                encoding=response.encoding
+            )
+
+        raise ValueError(f"지원하지 않는 데이터 소스: {namespace}")
+
+
+def _fixture_key(namespace: str, func_name: str, args: tuple, kwargs: dict) -> str:
+    """호출 인자를 안정적인 문자열 키로 변환 (datetime 등은 문자열화)"""
+    def normalize(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in sorted(value.items())}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    payload = [namespace, func_name, normalize(list(args)), normalize(kwargs)]
+    return json.dumps(payload, ensure_ascii=False, default=str, sort_keys=True)
+
+
+def _load_fixture(path: str) -> Dict[str, tuple]:
+    if not os.path.exists(path):
+        return {}
+    with gzip.open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class RecordingDataSource(DataSource):
+    """내부 소스의 응답(예외 포함)을 기록하고 종료 시 픽스처 파일로 저장"""
+
+    def __init__(self, path: str, inner: DataSource = None):
+        self.path = path
+        self.inner = inner if inner is not None else LiveDataSource()
+        self._records = _load_fixture(path)
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def call(self, namespace: str, func_name: str, *args, **kwargs) -> Any:
+        key = _fixture_key(namespace, func_name, args, kwargs)
+        try:
+            result = self.inner.call(namespace, func_name, *args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._records[key] = ('error', f"{type(e).__name__}: {e}")
+            raise
+
+        with self._lock:
+            self._records[key] = ('ok', result)
+        return result
+
+    def save(self):
+        with self._lock:
+            records = dict(self._records)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        logger.info(f"데이터 소스 픽스처 저장 완료: {self.path} ({len(records)}개 호출)")
+
+
+class ReplayDataSource(DataSource):
+    """기록된 픽스처를 재생. latency는 호출당 지연(초) 또는 네임스페이스별 지연 딕셔너리"""
+
+    def __init__(self, path: str, latency: Union[float, Dict[str, float]] = 0.0):
+        self.path = path
+        self.latency = latency
+        self._records = _load_fixture(path)
+        self.misses = 0
+        logger.info(f"데이터 소스 픽스처 로드: {path} ({len(self._records)}개 호출)")
+
+    def call(self, namespace: str, func_name: str, *args, **kwargs) -> Any:
+        delay = self.latency.get(namespace, 0.0) if isinstance(self.latency, dict) else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        key = _fixture_key(namespace, func_name, args, kwargs)
+        record = self._records.get(key)
+        if record is None:
+            self.misses += 1
+            raise DataSourceError(f"기록되지 않은 호출: {namespace}.{func_name}{args}")
+
+        status, payload = record
+        if status == 'error':
+            raise DataSourceError(payload)
+        return payload
+
+
+_default_source: DataSource = LiveDataSource()
+
+def get_default_source() -> DataSource:
+    return _default_source
+
+def set_default_source(source: DataSource):
+    global _default_source
+    _default_source = source
+
+def create_data_source(record_path: str = None, replay_path: str = None,
+                       replay_latency: float = 0.0) -> DataSource:
+    if record_path and replay_path:
+        raise ValueError("기록 모드와 재생 모드는 동시에 사용할 수 없습니다.")
+    if replay_path:
+        return ReplayDataSource(replay_path, latency=replay_latency)
+    if record_path:
+        return RecordingDataSource(record_path)
+    return LiveDataSource()
@@ -0,0 +1,191 @@
+"""
+헤지(hedged) 요청 수집 엔진
+소스별 토큰 버킷 속도 제한, 지터가 있는 지수 백오프 재시도, 호출 단위 데드라인을 적용하고
+주 소스가 지연 예산을 넘기면 대체 소스를 동시에 시작해 먼저 성공한 결과를 사용한다.
+
+후보 하나가 외부 API를 여러 번(동시에) 호출할 수 있으므로 토큰은 시도 단위가 아니라
+후보 함수 안의 외부 호출마다 throttle()로 차감한다.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import queue
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 소스별 (초당 요청 수, 버스트 크기)
+DEFAULT_RATE_LIMITS = {
+    'krx': (2.0, 4),
+    'yfinance': (1.0, 2)
+}
+
+class FetchError(Exception):
+    """모든 소스가 실패했거나 데드라인을 넘긴 경우"""
+
+    def __init__(self, message: str, errors: Dict[str, Exception] = None):
+        super().__init__(message)
+        self.errors = errors or {}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline_at: float = None) -> bool:
+        """토큰 1개를 얻을 때까지 대기. 데드라인 안에 얻지 못하면 False"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+
+            if deadline_at is not None and now + wait > deadline_at:
+                return False
+            time.sleep(wait)
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 5.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """full jitter: [0, min(max_delay, base * 2^(attempt-1))]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class FetchResult:
+    def __init__(self, value: Any, source: str, elapsed: float, attempts: int, hedged: bool):
+        self.value = value
+        self.source = source
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.hedged = hedged
+
+
+class FetchEngine:
+    def __init__(self, rate_limits: Dict[str, Tuple[float, int]] = None, retry: RetryPolicy = None,
+                 hedge_after: float = 5.0, deadline: float = 60.0):
+        limits = dict(DEFAULT_RATE_LIMITS)
+        limits.update(rate_limits or {})
+        self.buckets = {name: TokenBucket(rate, int(burst)) for name, (rate, burst) in limits.items()}
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.hedge_after = hedge_after
+        self.deadline = deadline
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'FetchEngine':
+        retry_config = config.get('retry', {})
+        return cls(
+            rate_limits={name: tuple(limit) for name, limit in config.get('rate_limits', {}).items()},
+            retry=RetryPolicy(
+                max_attempts=retry_config.get('max_attempts', 3),
+                base_delay=retry_config.get('base_delay', 0.5),
+                max_delay=retry_config.get('max_delay', 5.0)
+            ),
+            hedge_after=config.get('hedge_after', 5.0),
+            deadline=config.get('deadline', 60.0)
+        )
+
+    def throttle(self, name: str, deadline_at: float = None):
+        """name 소스 외부 호출 1회분 토큰 획득. 데드라인(기본: 지금 + deadline) 안에 얻지 못하면 FetchError"""
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            return
+        if deadline_at is None:
+            deadline_at = time.monotonic() + self.deadline
+        if not bucket.acquire(deadline_at):
+            raise FetchError(f"{name} 속도 제한 대기 중 데드라인 도달")
+
+    def fetch(self, candidates: List[Tuple[str, Callable[[], Any]]],
+              hedge_after: float = None, deadline: float = None) -> FetchResult:
+        """candidates: 우선순위 순의 (소스 이름, 호출 함수). 함수는 실패 시 예외를 발생시켜야 하며,
+        외부 호출마다 throttle(소스 이름)으로 속도 제한을 적용해야 함"""
+        hedge_after = self.hedge_after if hedge_after is None else hedge_after
+        deadline = self.deadline if deadline is None else deadline
+
+        started = time.monotonic()
+        deadline_at = started + deadline
+        results: "queue.Queue" = queue.Queue()
+        cancel = threading.Event()
+        errors: Dict[str, Exception] = {}
+        launched = 0
+        finished = 0
+
+        def launch():
+            nonlocal launched
+            name, func = candidates[launched]
+            launched += 1
+            # 응답이 없는 호출이 프로세스 종료를 막지 않도록 데몬 스레드 사용
+            threading.Thread(
+                target=self._run, args=(name, func, deadline_at, cancel, results), daemon=True
+            ).start()
+            return time.monotonic() + hedge_after
+
+        next_hedge_at = launch()
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline_at:
+                cancel.set()
+                raise FetchError(f"데드라인 {deadline:.1f}초 초과", errors)
+
+            wait_until = deadline_at if launched >= len(candidates) else min(deadline_at, next_hedge_at)
+            try:
+                name, ok, payload, attempts = results.get(timeout=max(0.0, wait_until - now))
+            except queue.Empty:
+                if launched < len(candidates) and time.monotonic() >= next_hedge_at:
+                    logger.warning(f"{candidates[launched - 1][0]} 응답 지연 ({hedge_after:.1f}초 초과), "
+                                   f"{candidates[launched][0]} 헤지 요청 시작")
+                    next_hedge_at = launch()
+                continue
+
+            finished += 1
+            if ok:
+                cancel.set()
+                elapsed = time.monotonic() - started
+                return FetchResult(payload, name, elapsed, attempts, hedged=launched > 1)
+
+            errors[name] = payload
+            logger.warning(f"{name} 수집 실패 ({attempts}회 시도): {payload}")
+            if launched < len(candidates):
+                next_hedge_at = launch()
+            elif finished >= launched:
+                raise FetchError("모든 소스 수집 실패", errors)
+
+    def _run(self, name: str, func: Callable[[], Any], deadline_at: float,
+             cancel: threading.Event, results: "queue.Queue"):
+        last_error: Optional[Exception] = None
+        attempt = 0
+
+        for attempt in range(1, self.retry.max_attempts + 1):
+            if cancel.is_set():
+                return
+
+            try:
+                value = func()
+                results.put((name, True, value, attempt))
+                return
+            except Exception as e:
+                last_error = e
+
+            if attempt < self.retry.max_attempts:
+                delay = self.retry.backoff(attempt)
+                if time.monotonic() + delay >= deadline_at:
+                    break
+                if cancel.wait(delay):
+                    return
+
+        results.put((name, False, last_error, attempt))
@@ -0,0 +1,167 @@
+"""
+비동기 크롤러 코어
+asyncio 이벤트 루프에서 여러 URL을 동시에 요청하고, 전체/호스트별 세마포어로 동시 요청 수를 제한한다.
+실제 HTTP 호출은 DataSource(http_get)를 전용 스레드 풀에서 실행하므로 기록/재생이 그대로 동작하며,
+LiveDataSource는 호스트별 keep-alive 연결 풀을 가진 requests 세션을 재사용한다.
+HttpCache를 지정하면 TTL 안의 요청은 캐시로 응답하고, 이후에는 조건부 요청으로 재검증한다.
+(기록/재생 데이터 소스에서는 모든 요청이 픽스처를 거치도록 캐시를 끈다.)
+동기 호출자는 fetch_all() / get()을 그대로 호출하면 된다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Optional
+from urllib.parse import urlsplit
+import asyncio
+import functools
+import logging
+from ..data_source.data_source import (DataSource, HttpResponse, RecordingDataSource, ReplayDataSource,
+                                       get_default_source)
+from .http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL, HttpCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PER_HOST_LIMIT = 4
+# 요청 1건의 타임아웃 (초), fetch_all 전체 타임아웃 (초)
+DEFAULT_HOST_TIMEOUT = 10.0
+DEFAULT_TOTAL_TIMEOUT = 20.0
+
+class CrawlTimeout(Exception):
+    """요청이 호스트 타임아웃 또는 전체 타임아웃 안에 끝나지 않은 경우"""
+
+
+def run_sync(coro) -> Any:
+    """동기 코드에서 코루틴 실행. 이미 이벤트 루프가 도는 스레드(노트북, 웹 서버 등)면 별도 스레드에서 실행"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class AsyncCrawler:
+    def __init__(self, source: DataSource = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT, host_timeout: float = DEFAULT_HOST_TIMEOUT,
+                 total_timeout: float = DEFAULT_TOTAL_TIMEOUT, cache: HttpCache = None):
+        self.source = source if source is not None else get_default_source()
+        # 기록/재생 모드에서는 캐시를 쓰지 않음: 캐시 적중 응답은 기록되지 않고,
+        # 조건부 요청 헤더가 픽스처 키를 로컬 캐시 상태에 따라 바꾸기 때문
+        if cache is not None and isinstance(self.source, (RecordingDataSource, ReplayDataSource)):
+            logger.info("기록/재생 데이터 소스에서는 HTTP 캐시를 사용하지 않습니다.")
+            cache = None
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.host_timeout = host_timeout
+        self.total_timeout = total_timeout
+        # 동시 요청 수만큼의 작업 스레드 (호출마다 새로 만들지 않음)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='crawler')
+
+    @classmethod
+    def from_config(cls, config: Dict, source: DataSource = None) -> 'AsyncCrawler':
+        cache = None
+        if config.get('cache_enabled', True):
+            cache = HttpCache(
+                cache_dir=config.get('cache_dir', DEFAULT_CACHE_DIR),
+                ttl=config.get('cache_ttl', DEFAULT_CACHE_TTL)
+            )
+        return cls(
+            source=source,
+            max_concurrency=config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY),
+            per_host_limit=config.get('per_host_limit', DEFAULT_PER_HOST_LIMIT),
+            host_timeout=config.get('host_timeout', DEFAULT_HOST_TIMEOUT),
+            total_timeout=config.get('total_timeout', DEFAULT_TOTAL_TIMEOUT),
+            cache=cache
+        )
+
+    def fetch_all(self, urls: Dict[Hashable, str], total_timeout: float = None,
+                  **kwargs) -> Dict[Hashable, Any]:
+        """{키: URL}을 동시에 요청. 결과는 {키: HttpResponse 또는 예외} (실패한 요청도 키는 유지)"""
+        return run_sync(self.fetch_many(urls, total_timeout, **kwargs))
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        """URL 하나를 요청. 실패하면 예외 발생"""
+        result = self.fetch_all({url: url}, **kwargs)[url]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def fetch_many(self, urls: Dict[Hashable, str], total_timeout: float = None,
+                         **kwargs) -> Dict[Hashable, Any]:
+        total_timeout = self.total_timeout if total_timeout is None else total_timeout
+        if not urls:
+            return {}
+
+        # 세마포어는 실행 중인 이벤트 루프에 묶이므로 호출마다 생성
+        limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        tasks = {}
+        for key, url in urls.items():
+            host = urlsplit(url).netloc
+            if host not in host_limits:
+                host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+            tasks[key] = asyncio.ensure_future(self._fetch(url, limit, host_limits[host], **kwargs))
+
+        done, pending = await asyncio.wait(tasks.values(), timeout=total_timeout)
+        for task in pending:
+            task.cancel()
+
+        results = {}
+        for key, task in tasks.items():
+            if task in done:
+                error = task.exception()
+                results[key] = error if error is not None else task.result()
+            else:
+                results[key] = CrawlTimeout(f"전체 타임아웃 {total_timeout:.1f}초 초과: {urls[key]}")
+
+        if pending:
+            logger.warning(f"크롤링 전체 타임아웃으로 {len(pending)}/{len(tasks)}개 요청 취소")
+        return results
+
+    async def _fetch(self, url: str, limit: asyncio.Semaphore, host_limit: asyncio.Semaphore,
+                     **kwargs) -> HttpResponse:
+        kwargs.setdefault('timeout', self.host_timeout)
+        call = functools.partial(self._request, url, **kwargs)
+        loop = asyncio.get_running_loop()
+
+        async with limit, host_limit:
+            try:
+                # 대기열 시간은 제외하고 요청 자체에만 호스트 타임아웃 적용
+                response = await asyncio.wait_for(loop.run_in_executor(self._executor, call), self.host_timeout)
+            except asyncio.TimeoutError:
+                raise CrawlTimeout(f"호스트 타임아웃 {self.host_timeout:.1f}초 초과: {url}")
+
+        response.raise_for_status()
+        return response
+
+    def _request(self, url: str, **kwargs) -> HttpResponse:
+        """작업 스레드에서 실행: 캐시 확인 → (조건부) 요청 → 캐시 갱신"""
+        if self.cache is None:
+            return self.source.http_get(url, **kwargs)
+
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.to_response()
+
+        if entry is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.conditional_headers(entry)}
+
+        try:
+            response = self.source.http_get(url, **kwargs)
+        except Exception as e:
+            if entry is None:
+                raise
+            # 재검증 실패 시 만료된 캐시라도 사용
+            logger.warning(f"재검증 실패, 만료된 캐시 사용 ({url}): {e}")
+            return entry.to_response()
+
+        if response.status_code == 304 and entry is not None:
+            return self.cache.touch(entry, response).to_response()
+
+        self.cache.store(url, response)
+        return response
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,142 @@
+"""
+HTTP 응답 디스크 캐시
+URL별로 응답 본문과 검증자(ETag, Last-Modified)를 저장한다.
+저장 후 TTL 안의 요청은 네트워크 없이 캐시로 응답하고, TTL이 지나면 조건부 요청
+(If-None-Match / If-Modified-Since)으로 재검증해 변경이 없으면(304) 저장된 본문을 재사용한다.
+"""
+
+from typing import Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from ..data_source.data_source import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "data/http_cache"
+# 재검증 없이 캐시를 그대로 쓰는 시간 (초)
+DEFAULT_CACHE_TTL = 300.0
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """대소문자 구분 없이 헤더 조회"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CacheEntry:
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 encoding: Optional[str], fetched_at: float):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.fetched_at = fetched_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return _header(self.headers, 'ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return _header(self.headers, 'Last-Modified')
+
+    def age(self, now: float = None) -> float:
+        return (now if now is not None else time.time()) - self.fetched_at
+
+    def to_response(self) -> HttpResponse:
+        return HttpResponse(self.url, self.status_code, dict(self.headers), self.content, self.encoding)
+
+
+class HttpCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(meta_path) or not os.path.exists(body_path):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                content = f.read()
+        except Exception as e:
+            logger.warning(f"HTTP 캐시 로드 실패 ({url}): {e}")
+            return None
+
+        if meta.get('url') != url:
+            return None
+        return CacheEntry(url, meta['status_code'], meta['headers'], content,
+                          meta.get('encoding'), meta['fetched_at'])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age() < self.ttl
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        """재검증용 조건부 요청 헤더"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, response: HttpResponse) -> Optional[CacheEntry]:
+        """200 응답만 요청 URL 기준으로 저장 (검증자가 없어도 TTL 동안은 재사용)"""
+        if response.status_code != 200:
+            return None
+
+        entry = CacheEntry(url, response.status_code, dict(response.headers), response.content,
+                           response.encoding, time.time())
+        self._write(entry, write_body=True)
+        return entry
+
+    def touch(self, entry: CacheEntry, response: HttpResponse) -> CacheEntry:
+        """304 응답: 본문은 그대로 두고 수신 시각과 갱신된 검증자만 반영"""
+        headers = dict(entry.headers)
+        for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date'):
+            value = _header(response.headers, name)
+            if value is not None:
+                headers = {key: val for key, val in headers.items() if key.lower() != name.lower()}
+                headers[name] = value
+
+        entry = CacheEntry(entry.url, entry.status_code, headers, entry.content, entry.encoding, time.time())
+        self._write(entry, write_body=False)
+        return entry
+
+    def _write(self, entry: CacheEntry, write_body: bool):
+        meta_path, body_path = self._paths(entry.url)
+        meta = {
+            'url': entry.url,
+            'status_code': entry.status_code,
+            'headers': entry.headers,
+            'encoding': entry.encoding,
+            'fetched_at': entry.fetched_at
+        }
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+                if write_body:
+                    with open(f"{body_path}.tmp", 'wb') as f:
+                        f.write(entry.content)
+                    os.replace(f"{body_path}.tmp", body_path)
+                with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, ensure_ascii=False)
+                os.replace(f"{meta_path}.tmp", meta_path)
+        except Exception as e:
+            logger.warning(f"HTTP 캐시 저장 실패 ({entry.url}): {e}")
@@ -1,18 +1,44 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+import asyncio
 import logging
 import time
 import re
 from ..utils.market_utils import KST
+from ..utils.keyword_matcher import get_keyword_matcher
+from ..data_source.data_source import DataSource, get_default_source
+from .async_crawler import AsyncCrawler, run_sync
+from .http_cache import HttpCache
+from .news_dedup import NearDuplicateIndex, remove_near_duplicates
+from .news_page_cache import NewsPageCache
+from .news_parser import DAUM_MARKET_SPEC, NAVER_MARKET_SPEC, NAVER_STOCK_SPEC, parse_news_list
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 날짜별 목록 페이지를 따라가는 최대 페이지 수, 한 번에 동시 요청할 페이지 수
+DEFAULT_MAX_PAGES = 10
+DEFAULT_PAGE_BATCH = 3
+
+PUBLISHED_DAY_PATTERN = re.compile(r'^(\d{4})[-.](\d{2})[-.](\d{2})')
+
 class NewsCrawler:
-    def __init__(self):
+    def __init__(self, source: DataSource = None, crawler: AsyncCrawler = None,
+                 page_cache: NewsPageCache = None, max_pages: int = DEFAULT_MAX_PAGES,
+                 page_batch: int = DEFAULT_PAGE_BATCH, dedup_index: NearDuplicateIndex = None):
+        self.source = source if source is not None else get_default_source()
+        # 시장 뉴스 소스(네이버, 다음)는 비동기 크롤러로 동시에 요청
+        # (TTL 동안은 디스크 캐시, 이후 조건부 요청으로 재검증)
+        self.crawler = crawler if crawler is not None else AsyncCrawler(source=self.source, cache=HttpCache())
+        # 지난 날짜의 목록 페이지는 (소스, 날짜, 페이지) 단위로 영구 저장
+        self.page_cache = page_cache if page_cache is not None else NewsPageCache()
+        # 키워드/감성 사전을 합친 다중 패턴 매처 (프로세스 전역)
+        self.keyword_matcher = get_keyword_matcher()
+        # 최근 며칠간 수집한 제목 지문 (유사 중복 / 지난 기사 재등장 제거)
+        self.dedup_index = dedup_index if dedup_index is not None else NearDuplicateIndex()
+        self.max_pages = max_pages
+        self.page_batch = page_batch
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -20,124 +46,135 @@ class NewsCrawler:
             'naver_finance': 'https://finance.naver.com',
             'daum_finance': 'https://finance.daum.net'
         }
+        self.market_news_urls = {
+            'naver': "https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=258",
+            'daum': "https://finance.daum.net/news"
+        }
     
     def get_market_news(self, date: datetime = None, max_news: int = 20) -> List[Dict]:
         if date is None:
             date = datetime.now(KST)
         
-        news_list = []
-        
-        # 네이버 금융 뉴스 크롤링
-        naver_news = self._crawl_naver_finance_news(date, max_news // 2)
-        news_list.extend(naver_news)
+        # 네이버(날짜별 페이지) / 다음(당일 목록) 금융 뉴스 동시 크롤링
+        naver_news, daum_news = run_sync(self._gather_market_news(date, max_news))
+        news_list = naver_news + daum_news
         
-        # 다음 금융 뉴스 크롤링
-        daum_news = self._crawl_daum_finance_news(date, max_news // 2)
-        news_list.extend(daum_news)
-        
-        # 중복 제거 및 정렬
-        news_list = self._remove_duplicates(news_list)
+        # 유사 중복 제거 및 정렬
+        news_list = self._remove_duplicates(news_list, date)
+        # 백필 중이면 처리 중인 날짜 기준으로 보존 기간을 적용
+        self.dedup_index.save(as_of=date.strftime('%Y%m%d'))
         news_list = sorted(news_list, key=lambda x: x['published_time'], reverse=True)
         
-        logger.info(f"시장 뉴스 수집 완료: {len(news_list)}개")
+        logger.info(f"시장 뉴스 수집 완료: {date.strftime('%Y-%m-%d')} {len(news_list)}개")
         return news_list[:max_news]
     
-    def _crawl_naver_finance_news(self, date: datetime, max_news: int) -> List[Dict]:
+    async def _gather_market_news(self, date: datetime, max_news: int):
+        return await asyncio.gather(
+            self._collect_naver_news(date, max_news),
+            self._collect_daum_news(date, max_news // 2)
+        )
+    
+    async def _collect_naver_news(self, date: datetime, max_news: int) -> List[Dict]:
+        """날짜 지정 목록을 page_batch개씩 동시에 요청하며 대상일을 벗어나거나 목록이 끝날 때까지 수집"""
+        date_str = date.strftime('%Y%m%d')
+        target_day = date.strftime('%Y-%m-%d')
         news_list = []
-        try:
-            # 네이버 금융 뉴스 페이지
-            url = "https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=258"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+        seen_links = set()
+        
+        for first_page in range(1, self.max_pages + 1, self.page_batch):
+            pages = list(range(first_page, min(first_page + self.page_batch, self.max_pages + 1)))
+            page_items = await self._fetch_naver_pages(date_str, pages)
             
-            # 뉴스 리스트 추출
-            news_items = soup.find_all('tr', class_='')
+            finished = False
+            for page in pages:
+                items = page_items.get(page)
+                if not items:
+                    finished = True
+                    break
+                
+                # 마지막 페이지를 넘기면 같은 목록이 반복됨
+                new_items = [item for item in items if item['link'] not in seen_links]
+                if not new_items:
+                    finished = True
+                    break
+                seen_links.update(item['link'] for item in new_items)
+                
+                days = [self._published_day(item) for item in new_items]
+                news_list.extend(item for item, day in zip(new_items, days) if day in (None, target_day))
+                if any(day is not None and day < target_day for day in days):
+                    finished = True
+                    break
             
-            for item in news_items[:max_news]:
-                try:
-                    # 제목 추출
-                    title_elem = item.find('a', class_='tit')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = "https://finance.naver.com" + title_elem.get('href', '')
-                    
-                    # 시간 추출
-                    time_elem = item.find('span', class_='wdate')
-                    published_time = time_elem.get_text(strip=True) if time_elem else ""
-                    
-                    # 언론사 추출
-                    press_elem = item.find('span', class_='press')
-                    press = press_elem.get_text(strip=True) if press_elem else ""
-                    
-                    news_list.append({
-                        'title': title,
-                        'link': link,
-                        'published_time': published_time,
-                        'press': press,
-                        'source': 'naver'
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"네이버 뉴스 항목 처리 실패: {e}")
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"네이버 금융 뉴스 크롤링 실패: {e}")
+            if finished or len(news_list) >= max_news:
+                break
         
         return news_list
     
-    def _crawl_daum_finance_news(self, date: datetime, max_news: int) -> List[Dict]:
-        news_list = []
-        try:
-            # 다음 금융 뉴스 페이지
-            url = "https://finance.daum.net/news"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 뉴스 리스트 추출 (다음 페이지 구조에 맞게 조정)
-            news_items = soup.find_all('li', class_='item_news')
-            
-            for item in news_items[:max_news]:
-                try:
-                    # 제목 추출
-                    title_elem = item.find('a', class_='link_news')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
-                    
-                    # 시간 추출
-                    time_elem = item.find('span', class_='txt_date')
-                    published_time = time_elem.get_text(strip=True) if time_elem else ""
-                    
-                    # 언론사 추출
-                    press_elem = item.find('span', class_='txt_press')
-                    press = press_elem.get_text(strip=True) if press_elem else ""
-                    
-                    news_list.append({
-                        'title': title,
-                        'link': link,
-                        'published_time': published_time,
-                        'press': press,
-                        'source': 'daum'
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"다음 뉴스 항목 처리 실패: {e}")
+    async def _fetch_naver_pages(self, date_str: str, pages: List[int]) -> Dict[int, List[Dict]]:
+        """페이지별 뉴스 항목. 캐시에 없는 페이지만 동시에 요청 (실패한 페이지는 결과에서 제외)"""
+        result = {}
+        urls = {}
+        for page in pages:
+            cached = self.page_cache.get('naver', date_str, page)
+            if cached is not None:
+                result[page] = cached
+            else:
+                urls[page] = f"{self.market_news_urls['naver']}&date={date_str}&page={page}"
+        
+        if urls:
+            responses = await self.crawler.fetch_many(urls, headers=self.headers)
+            for page, response in responses.items():
+                if isinstance(response, Exception):
+                    logger.error(f"네이버 금융 뉴스 크롤링 실패 ({date_str} {page}페이지): {response}")
                     continue
-                    
-        except Exception as e:
-            logger.error(f"다음 금융 뉴스 크롤링 실패: {e}")
+                items = self._parse_naver_finance_news(response.content, None, response.encoding)
+                self.page_cache.put('naver', date_str, page, items)
+                result[page] = items
         
+        return result
+    
+    async def _collect_daum_news(self, date: datetime, max_news: int) -> List[Dict]:
+        # 다음 금융 뉴스는 날짜 지정 목록이 없어 당일 보고서에만 사용
+        if date.strftime('%Y%m%d') != datetime.now(KST).strftime('%Y%m%d'):
+            return []
+        
+        responses = await self.crawler.fetch_many({'daum': self.market_news_urls['daum']}, headers=self.headers)
+        response = responses['daum']
+        if isinstance(response, Exception):
+            logger.error(f"다음 금융 뉴스 크롤링 실패: {response}")
+            return []
+        return self._parse_daum_finance_news(response.content, max_news, response.encoding)
+    
+    @staticmethod
+    def _published_day(news: Dict) -> Optional[str]:
+        """게시 시각의 날짜 (YYYY-MM-DD). 형식을 알 수 없으면 None"""
+        match = PUBLISHED_DAY_PATTERN.match(news.get('published_time', ''))
+        if not match:
+            return None
+        return '-'.join(match.groups())
+    
+    def _parse_naver_finance_news(self, content: bytes, max_news: Optional[int], encoding: str = None) -> List[Dict]:
+        news_list = []
+        for item in parse_news_list(content, NAVER_MARKET_SPEC, max_news, encoding):
+            news_list.append({
+                'title': item['title'],
+                'link': "https://finance.naver.com" + item['href'],
+                'published_time': item['published_time'],
+                'press': item['press'],
+                'source': 'naver'
+            })
+        return news_list
+    
+    def _parse_daum_finance_news(self, content: bytes, max_news: int, encoding: str = None) -> List[Dict]:
+        news_list = []
+        for item in parse_news_list(content, DAUM_MARKET_SPEC, max_news, encoding):
+            news_list.append({
+                'title': item['title'],
+                'link': item['href'],
+                'published_time': item['published_time'],
+                'press': item['press'],
+                'source': 'daum'
+            })
         return news_list
     
     def get_stock_related_news(self, ticker: str, stock_name: str, max_news: int = 5) -> List[Dict]:
@@ -147,101 +184,85 @@ class NewsCrawler:
             # 네이버 종목 뉴스 페이지
             url = f"https://finance.naver.com/item/news_news.naver?code={ticker}"
             
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 뉴스 리스트 추출
-            news_items = soup.find_all('tr')
-            
-            for item in news_items[:max_news]:
-                try:
-                    title_elem = item.find('a', class_='tit')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = "https://finance.naver.com" + title_elem.get('href', '')
-                    
-                    # 시간 추출
-                    time_elem = item.find('span', class_='date')
-                    published_time = time_elem.get_text(strip=True) if time_elem else ""
-                    
-                    news_list.append({
-                        'title': title,
-                        'link': link,
-                        'published_time': published_time,
-                        'ticker': ticker,
-                        'stock_name': stock_name
-                    })
-                    
-                except Exception as e:
-                    continue
+            response = self.crawler.get(url, headers=self.headers)
+            news_list = self._parse_stock_news(response.content, ticker, stock_name, max_news, response.encoding)
                     
         except Exception as e:
             logger.error(f"종목 뉴스 크롤링 실패 ({ticker}): {e}")
         
         return news_list
     
+    def get_stocks_related_news(self, stocks: Dict[str, str], max_news: int = 5,
+                                deadline: float = None) -> Dict[str, List[Dict]]:
+        """여러 종목({티커: 종목명})의 뉴스를 동시에 수집. 데드라인까지 받은 종목만 반환 (부분 결과)"""
+        if not stocks:
+            return {}
+        
+        urls = {ticker: f"https://finance.naver.com/item/news_news.naver?code={ticker}" for ticker in stocks}
+        # 동시 요청 수와 호스트별 요청 수는 크롤러 설정으로 제한
+        responses = self.crawler.fetch_all(urls, total_timeout=deadline, headers=self.headers)
+        
+        result = {}
+        failed = 0
+        for ticker, response in responses.items():
+            if isinstance(response, Exception):
+                failed += 1
+                logger.debug(f"종목 뉴스 크롤링 실패 ({ticker}): {response}")
+                continue
+            try:
+                result[ticker] = self._parse_stock_news(response.content, ticker, stocks[ticker], max_news,
+                                                        response.encoding)
+            except Exception as e:
+                failed += 1
+                logger.debug(f"종목 뉴스 파싱 실패 ({ticker}): {e}")
+        
+        if failed:
+            logger.warning(f"종목 뉴스 일부 수집 실패: {failed}/{len(stocks)}개 종목")
+        logger.info(f"종목 뉴스 수집 완료: {len(result)}/{len(stocks)}개 종목")
+        return result
+    
+    def _parse_stock_news(self, content: bytes, ticker: str, stock_name: str, max_news: int,
+                          encoding: str = None) -> List[Dict]:
+        news_list = []
+        for item in parse_news_list(content, NAVER_STOCK_SPEC, max_news, encoding):
+            news_list.append({
+                'title': item['title'],
+                'link': "https://finance.naver.com" + item['href'],
+                'published_time': item['published_time'],
+                'ticker': ticker,
+                'stock_name': stock_name
+            })
+        return news_list
+    
     def extract_market_keywords(self, news_list: List[Dict]) -> List[str]:
         if not news_list:
             return []
         
-        # 시장 관련 키워드 추출
-        keywords = []
-        market_keywords = [
-            '급등', '급락', '상승', '하락', '매수', '매도',
-            '실적', '분기', '영업이익', '매출',
-            '공시', '발표', '계약', '투자',
-            '테마', '관련주', '동반상승', '동반하락',
-            '외국인', '기관', '개인투자자',
-            '코스피', '코스닥', '지수'
-        ]
-        
+        # 시장 관련 키워드 추출 (제목마다 한 번만 훑음, 등장 순서 유지)
+        keywords = {}
         for news in news_list:
-            title = news.get('title', '')
-            for keyword in market_keywords:
-                if keyword in title and keyword not in keywords:
-                    keywords.append(keyword)
+            for keyword in self.keyword_matcher.scan(news.get('title', '')).keywords:
+                keywords.setdefault(keyword, None)
         
-        return keywords
+        return list(keywords)
     
     def analyze_news_sentiment(self, news_list: List[Dict]) -> Dict:
         if not news_list:
             return {'positive': 0, 'negative': 0, 'neutral': 0}
         
-        positive_keywords = ['상승', '급등', '호재', '실적 개선', '매수', '투자 확대']
-        negative_keywords = ['하락', '급락', '악재', '실적 악화', '매도', '투자 축소']
-        
         sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
         
         for news in news_list:
-            title = news.get('title', '')
-            
-            positive_score = sum(1 for keyword in positive_keywords if keyword in title)
-            negative_score = sum(1 for keyword in negative_keywords if keyword in title)
-            
-            if positive_score > negative_score:
-                sentiment_counts['positive'] += 1
-            elif negative_score > positive_score:
-                sentiment_counts['negative'] += 1
-            else:
-                sentiment_counts['neutral'] += 1
+            hits = self.keyword_matcher.scan(news.get('title', ''))
+            sentiment_counts[hits.sentiment] += 1
         
         return sentiment_counts
     
-    def _remove_duplicates(self, news_list: List[Dict]) -> List[Dict]:
-        seen_titles = set()
-        unique_news = []
-        
-        for news in news_list:
-            title = news.get('title', '')
-            if title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_news.append(news)
-        
-        return unique_news
+    def _remove_duplicates(self, news_list: List[Dict], date: datetime = None) -> List[Dict]:
+        """정규화한 제목의 SimHash로 유사 중복 제거. date가 있으면 이전 거래일에 수집된 기사도 제외"""
+        if date is None:
+            return remove_near_duplicates(news_list, datetime.now(KST).strftime('%Y%m%d'))
+        return remove_near_duplicates(news_list, date.strftime('%Y%m%d'), history=self.dedup_index)
     
     def get_overseas_market_news(self) -> Dict:
         # 해외 시장 동향 (간단한 정보)
@@ -0,0 +1,206 @@
+"""
+유사 중복 뉴스 탐지 (SimHash + LSH)
+정규화한 제목(말머리·언론사 꼬리표 제거)의 문자 3-gram으로 64비트 SimHash 지문을 만들고,
+지문을 16비트 밴드 4개로 나눠 밴드 값별 버킷에 색인한다.
+해밍 거리 3 이하인 지문은 비둘기집 원리로 최소 한 밴드가 같으므로
+같은 버킷의 후보만 비교하면 되고, 이력 전체와 쌍으로 비교하지 않는다.
+
+색인은 최근 N일의 (지문, 최초 수집일)을 파일로 보관해 실행 간에 유지한다.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+DEFAULT_MAX_DISTANCE = 3
+DEFAULT_RETENTION_DAYS = 7
+SHINGLE_SIZE = 3
+
+# [특징주], (종합), 【속보】, <인터뷰> 같은 말머리/꼬리표
+BRACKET_PATTERN = re.compile(r'\[[^\]]*\]|\([^)]*\)|【[^】]*】|<[^>]*>|〈[^〉]*〉')
+# 제목 끝의 언론사 표기 (" - 연합뉴스", " | 한경")
+PRESS_SUFFIX_PATTERN = re.compile(r'\s*[-|│/]\s*[^-|│/]{1,15}$')
+NON_WORD_PATTERN = re.compile(r'[^\w]+')
+
+def normalize_title(title: str) -> str:
+    """비교용 제목: 말머리·언론사 꼬리표·문장부호 제거, 공백 정리, 소문자"""
+    text = BRACKET_PATTERN.sub(' ', title or '')
+    text = PRESS_SUFFIX_PATTERN.sub('', text)
+    text = NON_WORD_PATTERN.sub(' ', text)
+    return ' '.join(text.lower().split())
+
+def _shingle_hash(shingle: str) -> int:
+    # 프로세스마다 달라지는 hash() 대신 고정된 해시 (지문을 파일로 저장하므로)
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def simhash(text: str) -> int:
+    """정규화한 텍스트의 64비트 SimHash"""
+    if len(text) < SHINGLE_SIZE:
+        shingles = [text] if text else []
+    else:
+        shingles = [text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)]
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        value = _shingle_hash(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (value >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def title_fingerprint(title: str) -> Optional[int]:
+    normalized = normalize_title(title)
+    return simhash(normalized) if normalized else None
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    mask = (1 << BAND_BITS) - 1
+    return [(band, (fingerprint >> (band * BAND_BITS)) & mask) for band in range(BAND_COUNT)]
+
+
+class NearDuplicateIndex:
+    """(지문 → 최초 수집일) 색인. state_path가 없으면 메모리에서만 사용"""
+
+    def __init__(self, state_path: Optional[str] = "data/news_dedup/seen_index.json",
+                 max_distance: int = DEFAULT_MAX_DISTANCE, retention_days: int = DEFAULT_RETENTION_DAYS):
+        if max_distance >= BAND_COUNT:
+            raise ValueError(f"max_distance는 밴드 수({BAND_COUNT})보다 작아야 합니다: {max_distance}")
+        self.state_path = state_path
+        self.max_distance = max_distance
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self.first_seen: Dict[int, str] = {}
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.first_seen)
+
+    def find(self, fingerprint: int, before: str = None) -> Optional[int]:
+        """해밍 거리 max_distance 이내의 색인된 지문
+        (before가 있으면 그 날짜 이전 retention_days 안에 처음 본 것만)"""
+        cutoff = self._cutoff(before) if before is not None else None
+        with self._lock:
+            for key in _bands(fingerprint):
+                for candidate in self._buckets.get(key, ()):
+                    if before is not None and not cutoff <= self.first_seen[candidate] < before:
+                        continue
+                    if bin(candidate ^ fingerprint).count('1') <= self.max_distance:
+                        return candidate
+        return None
+
+    def add(self, fingerprint: int, date_str: str):
+        with self._lock:
+            seen = self.first_seen.get(fingerprint)
+            if seen is not None:
+                # 백필로 더 이른 날짜에 수집되면 최초 수집일을 앞당기고,
+                # 보존 기간이 지난 뒤 다시 수집되면 새로 본 것으로 갱신
+                if date_str < seen or seen < self._cutoff(date_str):
+                    self.first_seen[fingerprint] = date_str
+                return
+            self.first_seen[fingerprint] = date_str
+            for key in _bands(fingerprint):
+                self._buckets.setdefault(key, []).append(fingerprint)
+
+    def prune(self, as_of: str = None):
+        """as_of(생략 시 가장 최근 수집일) 기준 retention_days보다 오래된 지문 제거.
+        과거 기간을 백필할 때는 처리 중인 날짜를 넘겨야 방금 기록한 지문이 지워지지 않음"""
+        with self._lock:
+            if not self.first_seen:
+                return
+            cutoff = self._cutoff(as_of or max(self.first_seen.values()))
+            expired = [fp for fp, date_str in self.first_seen.items() if date_str < cutoff]
+            if not expired:
+                return
+            for fingerprint in expired:
+                del self.first_seen[fingerprint]
+            self._rebuild_buckets()
+
+    def save(self, as_of: str = None):
+        if not self.state_path:
+            return
+        self.prune(as_of)
+        with self._lock:
+            state = {
+                'max_distance': self.max_distance,
+                # JSON 정수 범위 문제를 피하려고 16진수 문자열로 저장
+                'entries': [[f"{fp:016x}", date_str] for fp, date_str in self.first_seen.items()]
+            }
+
+            # 백필 작업 스레드가 동시에 저장해도 임시 파일이 섞이지 않도록 잠금 안에서 기록
+            tmp_path = f"{self.state_path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.state_path)
+            except Exception as e:
+                logger.warning(f"뉴스 중복 색인 저장 실패: {e}")
+
+    def _cutoff(self, date_str: str) -> str:
+        return (datetime.strptime(date_str, '%Y%m%d') - timedelta(days=self.retention_days)).strftime('%Y%m%d')
+
+    def _rebuild_buckets(self):
+        self._buckets = {}
+        for fingerprint in self.first_seen:
+            for key in _bands(fingerprint):
+                self._buckets.setdefault(key, []).append(fingerprint)
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.first_seen = {int(fp, 16): date_str for fp, date_str in state.get('entries', [])}
+            self._rebuild_buckets()
+        except Exception as e:
+            logger.warning(f"뉴스 중복 색인 로드 실패, 새로 시작합니다: {e}")
+            self.first_seen = {}
+            self._buckets = {}
+
+
+def remove_near_duplicates(news_list: List[Dict], date_str: str,
+                           history: NearDuplicateIndex = None) -> List[Dict]:
+    """같은 호출 안의 유사 제목과, history에서 date_str 이전에 이미 수집된 기사를 제거.
+    정규화 후 제목이 비는 기사는 비교 없이 그대로 남긴다.
+    남은 기사는 history에 date_str로 기록 (저장은 호출자가 담당)"""
+    current = NearDuplicateIndex(state_path=None,
+                                 max_distance=history.max_distance if history else DEFAULT_MAX_DISTANCE)
+    unique_news = []
+    repeated = 0
+
+    for news in news_list:
+        fingerprint = title_fingerprint(news.get('title', ''))
+        if fingerprint is None:
+            # 지문을 만들 수 없으면 SimHash/LSH 비교만 건너뜀
+            unique_news.append(news)
+            continue
+        if current.find(fingerprint) is not None:
+            continue
+        current.add(fingerprint, date_str)
+        if history is not None and history.find(fingerprint, before=date_str) is not None:
+            repeated += 1
+            continue
+        unique_news.append(news)
+
+    if history is not None:
+        for fingerprint in current.first_seen:
+            history.add(fingerprint, date_str)
+    if repeated:
+        logger.info(f"이전 거래일에 수집된 뉴스 {repeated}개 제외")
+    return unique_news
@@ -0,0 +1,54 @@
+"""
+뉴스 목록 페이지 캐시
+(소스, 날짜, 페이지) 단위로 파싱한 뉴스 항목을 저장한다.
+지난 날짜의 목록은 더 바뀌지 않으므로 한 번 받은 페이지는 백필 때 다시 요청하지 않는다.
+당일 목록은 새 기사가 들어오며 페이지 구성이 바뀌므로 저장하지 않는다.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+from ..utils.market_utils import KST
+
+logger = logging.getLogger(__name__)
+
+class NewsPageCache:
+    def __init__(self, cache_dir: str = "data/news_pages"):
+        self.cache_dir = cache_dir
+
+    def path(self, source: str, date_str: str, page: int) -> str:
+        return os.path.join(self.cache_dir, source, date_str, f"page_{page}.json")
+
+    def get(self, source: str, date_str: str, page: int) -> Optional[List[Dict]]:
+        path = self.path(source, date_str, page)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"뉴스 페이지 캐시 로드 실패 ({path}): {e}")
+            return None
+
+    def put(self, source: str, date_str: str, page: int, items: List[Dict]) -> bool:
+        """지난 날짜의 비어 있지 않은 페이지만 저장"""
+        if not items or not self.can_persist(date_str):
+            return False
+
+        path = self.path(source, date_str, page)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(items, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.warning(f"뉴스 페이지 캐시 저장 실패 ({path}): {e}")
+            return False
+
+    def can_persist(self, date_str: str) -> bool:
+        return date_str < datetime.now(KST).strftime('%Y%m%d')
@@ -0,0 +1,120 @@
+"""
+뉴스 목록 페이지 파서
+lxml로 페이지 전체를 한 번 파싱해 트리를 만든 뒤, 사이트별로 미리 컴파일한 XPath로
+뉴스 목록 컨테이너를 먼저 찾고 그 안에서만 항목 선택자를 실행해 제목, 링크, 시간, 언론사를 추출한다.
+항목 검색은 내비게이션/하단 영역을 훑지 않으므로 여러 페이지나 종목별 페이지를 연속으로 파싱해도 비용이 작다.
+"""
+
+from typing import Dict, List, Optional
+import logging
+from bs4.dammit import EncodingDetector
+from lxml import etree
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+def _has_class(tag: str, class_name: str) -> str:
+    """class 속성에 class_name이 포함된 요소 (BeautifulSoup의 class_ 조건과 동일)"""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+class NewsListSpec:
+    """사이트별 뉴스 목록 선택자 (컨테이너는 문서 기준, 항목은 컨테이너 기준, 나머지는 항목 기준 상대 경로)"""
+
+    def __init__(self, container: str, items: str, title: str, time: str, press: Optional[str] = None):
+        self.container = etree.XPath(container)
+        self.items = etree.XPath(items)
+        self.title = etree.XPath(title)
+        self.time = etree.XPath(time)
+        self.press = etree.XPath(press) if press else None
+
+
+# 네이버 금융 시장 뉴스: 목록 표(table.type5) 안에서 제목 링크(a.tit)가 있는 행만 항목으로 사용
+NAVER_MARKET_SPEC = NewsListSpec(
+    container=f"//{_has_class('table', 'type5')}",
+    items=f".//tr[.//{_has_class('a', 'tit')}]",
+    title=f".//{_has_class('a', 'tit')}",
+    time=f".//{_has_class('span', 'wdate')}",
+    press=f".//{_has_class('span', 'press')}"
+)
+
+# 다음 금융 뉴스: 뉴스 항목(li.item_news)을 직접 담은 목록
+DAUM_MARKET_SPEC = NewsListSpec(
+    container=f"//ul[{_has_class('li', 'item_news')}]",
+    items=f"./{_has_class('li', 'item_news')}",
+    title=f".//{_has_class('a', 'link_news')}",
+    time=f".//{_has_class('span', 'txt_date')}",
+    press=f".//{_has_class('span', 'txt_press')}"
+)
+
+# 네이버 종목 뉴스: 목록 표(table.type5)
+NAVER_STOCK_SPEC = NewsListSpec(
+    container=f"//{_has_class('table', 'type5')}",
+    items=f".//tr[.//{_has_class('a', 'tit')}]",
+    title=f".//{_has_class('a', 'tit')}",
+    time=f".//{_has_class('span', 'date')}"
+)
+
+def element_text(element) -> str:
+    """요소의 텍스트 (BeautifulSoup get_text(strip=True)와 같은 방식으로 공백 제거)"""
+    return ''.join(piece.strip() for piece in element.itertext())
+
+def _text(elements) -> str:
+    """첫 요소의 텍스트"""
+    if not elements:
+        return ""
+    return element_text(elements[0])
+
+def parse_document(content: bytes, encoding: Optional[str] = None):
+    """바이트 본문을 lxml 문서로 파싱 (인코딩: 응답 헤더 → 문서의 meta charset → UTF-8 순)"""
+    # requests는 charset 없는 text/* 응답을 ISO-8859-1로 표시하므로 이 경우는 문서 선언을 따름
+    if encoding and encoding.lower() in ('iso-8859-1', 'latin-1'):
+        encoding = None
+    if not encoding:
+        encoding = EncodingDetector.find_declared_encoding(content, is_html=True)
+    if not encoding:
+        try:
+            content.decode('utf-8')
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            encoding = None
+    parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+    return lxml_html.document_fromstring(content, parser=parser)
+
+def parse_news_list(content: bytes, spec: NewsListSpec, max_items: int = None,
+                    encoding: Optional[str] = None) -> List[Dict]:
+    """뉴스 항목별 title, href, published_time, press 추출 (제목 없는 항목은 제외)"""
+    if not content:
+        return []
+
+    try:
+        document = parse_document(content, encoding)
+    except (etree.ParserError, ValueError) as e:
+        logger.warning(f"뉴스 페이지 파싱 실패: {e}")
+        return []
+
+    containers = spec.container(document)
+    if not containers:
+        logger.debug("뉴스 목록 컨테이너를 찾을 수 없습니다.")
+        return []
+
+    items = []
+    for item in (item for container in containers for item in spec.items(container)):
+        titles = spec.title(item)
+        if not titles:
+            continue
+
+        title = _text(titles)
+        if not title:
+            continue
+
+        items.append({
+            'title': title,
+            'href': titles[0].get('href', ''),
+            'published_time': _text(spec.time(item)),
+            'press': _text(spec.press(item)) if spec.press is not None else ""
+        })
+        if max_items is not None and len(items) >= max_items:
+            break
+
+    return items
@@ -0,0 +1,96 @@
+"""
+뉴스 목록 파싱 벤치마크
+기존 방식(BeautifulSoup html.parser + 행마다 find)과 lxml 선택자 파서의 페이지당 파싱 시간을 비교한다.
+
+사용법:
+    python -m src.news_crawler.parse_benchmark                 # 합성 페이지로 측정
+    python -m src.news_crawler.parse_benchmark page1.html ...  # 저장한 네이버 시장 뉴스 페이지로 측정
+"""
+
+from typing import Callable, Dict, List
+import argparse
+import time
+from bs4 import BeautifulSoup
+from .news_parser import NAVER_MARKET_SPEC, parse_news_list
+
+def build_sample_page(rows: int = 20, padding: int = 300) -> bytes:
+    """네이버 시장 뉴스 목록과 같은 구조의 합성 페이지 (목록 밖 요소 padding개 포함)"""
+    filler = ''.join(f'<div class="nav"><a href="/menu/{i}">메뉴 {i}</a><span>설명</span></div>'
+                     for i in range(padding))
+    items = ''.join(
+        f'<tr class=""><td><a class="tit" href="/news/read.naver?article_id={i}">코스피 {i}번째 뉴스 제목</a>'
+        f'<span class="press">언론사{i % 7}</span><span class="wdate">2025-03-05 {9 + i % 7:02d}:{i % 60:02d}</span>'
+        f'</td></tr><tr class="line"><td></td></tr>'
+        for i in range(rows)
+    )
+    html = (f'<html><head><meta charset="euc-kr"></head><body>{filler}'
+            f'<table class="type5">{items}</table>{filler}</body></html>')
+    return html.encode('euc-kr')
+
+def parse_with_soup(content: bytes) -> List[Dict]:
+    """기존 NewsCrawler 방식"""
+    soup = BeautifulSoup(content, 'html.parser')
+    result = []
+    for item in soup.find_all('tr', class_=''):
+        title_elem = item.find('a', class_='tit')
+        if not title_elem:
+            continue
+        time_elem = item.find('span', class_='wdate')
+        press_elem = item.find('span', class_='press')
+        result.append({
+            'title': title_elem.get_text(strip=True),
+            'href': title_elem.get('href', ''),
+            'published_time': time_elem.get_text(strip=True) if time_elem else "",
+            'press': press_elem.get_text(strip=True) if press_elem else ""
+        })
+    return result
+
+def parse_with_lxml(content: bytes) -> List[Dict]:
+    return parse_news_list(content, NAVER_MARKET_SPEC)
+
+def measure(parser: Callable[[bytes], List[Dict]], pages: List[bytes], repeat: int) -> float:
+    """페이지당 평균 파싱 시간 (ms)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parser(page)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(pages))
+
+def run(pages: List[bytes], repeat: int = 20) -> Dict[str, float]:
+    expected = [parse_with_soup(page) for page in pages]
+    actual = [parse_with_lxml(page) for page in pages]
+    if expected != actual:
+        print("경고: 두 파서의 추출 결과가 다릅니다.")
+
+    results = {
+        'BeautifulSoup(html.parser)': measure(parse_with_soup, pages, repeat),
+        'lxml 선택자': measure(parse_with_lxml, pages, repeat)
+    }
+    items = sum(len(page_items) for page_items in actual)
+    print(f"페이지 {len(pages)}개, 뉴스 {items}건, 반복 {repeat}회")
+    for name, elapsed in results.items():
+        print(f"  {name:<28} {elapsed:8.2f} ms/페이지")
+    baseline, fast = results.values()
+    if fast > 0:
+        print(f"  속도 향상: {baseline / fast:.1f}배")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 목록 파싱 벤치마크")
+    parser.add_argument('files', nargs='*', help='측정할 HTML 파일 (없으면 합성 페이지 사용)')
+    parser.add_argument('--repeat', type=int, default=20, help='반복 횟수')
+    args = parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+    else:
+        pages = [build_sample_page()]
+
+    run(pages, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
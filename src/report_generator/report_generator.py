@@ -106,6 +106,13 @@ class ReportGenerator:
             'surge_stocks': data.get('surge_stocks', []),
             'plunge_stocks': data.get('plunge_stocks', []),
             'themes': data.get('themes', []),
+            'top_net_buys': data.get('top_net_buys', {}),
+            'flow_trend': data.get('flow_trend', {}),
+            'sector_flows': data.get('sector_flows', {}),
+            'sector_indices': data.get('sector_indices', {}),
+            'program_trading': data.get('program_trading', {}),
+            'short_selling_top': data.get('short_selling_top', []),
+            'foreign_ownership_top': data.get('foreign_ownership_top', []),
             'homework': homework
         }
     
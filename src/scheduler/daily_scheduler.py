@@ -1,31 +1,65 @@
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List
 import logging
 import json
 import os
 import pandas as pd
-from ..utils.market_utils import is_trading_day, KST
+from ..utils.market_utils import is_trading_day, get_previous_trading_day, KST
+from ..utils.trading_calendar import get_trading_calendar
 from ..data_collector.stock_data_collector import StockDataCollector
 from ..data_collector.investor_data_collector import InvestorDataCollector
-from ..news_crawler.news_crawler import NewsCrawler
+from ..data_collector.short_selling_collector import ShortSellingCollector
+from ..data_collector.foreign_ownership_collector import ForeignOwnershipCollector
+from ..news_crawler.news_crawler import DEFAULT_MAX_PAGES, DEFAULT_PAGE_BATCH, NewsCrawler
+from ..news_crawler.async_crawler import AsyncCrawler
+from ..news_crawler.news_dedup import DEFAULT_RETENTION_DAYS, NearDuplicateIndex
 from ..data_processor.stock_analyzer import StockAnalyzer
+from ..data_processor.flow_tracker import InvestorFlowTracker
 from ..report_generator.report_generator import ReportGenerator
+from ..data_source.data_source import DataSource
+from ..data_source.fetch_engine import FetchEngine
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _render_report_job(analyzed_data: dict, target_date: datetime, template_dir: str, output_dir: str) -> str:
+    """프로세스 풀에서 실행되는 보고서 렌더링 작업 (HTML/PDF/데이터 백업)"""
+    report_generator = ReportGenerator(template_dir=template_dir, output_dir=output_dir)
+    html_path = report_generator.generate_daily_report(analyzed_data, target_date)
+    report_generator.generate_pdf_report(html_path)
+    report_generator.save_report_data(analyzed_data, target_date)
+    return html_path
+
 class DailyScheduler:
-    def __init__(self, config_path: str = "config/config.json"):
+    def __init__(self, config_path: str = "config/config.json", data_source: DataSource = None):
         self.config = self._load_config(config_path)
         self.scheduler = BlockingScheduler(timezone=KST)
         
-        # 모듈 초기화
-        self.stock_collector = StockDataCollector()
-        self.investor_collector = InvestorDataCollector()
-        self.news_crawler = NewsCrawler()
-        self.analyzer = StockAnalyzer()
+        # 모듈 초기화 (data_source를 지정하면 모든 수집기가 해당 소스로 외부 호출)
+        self.stock_collector = StockDataCollector(
+            source=data_source,
+            fetch_engine=FetchEngine.from_config(self.config.get('fetch', {}))
+        )
+        self.investor_collector = InvestorDataCollector(source=data_source, store=self.stock_collector.store)
+        self.short_collector = ShortSellingCollector(source=data_source, store=self.stock_collector.store)
+        self.foreign_collector = ForeignOwnershipCollector(source=data_source, store=self.stock_collector.store)
+        news_config = self.config.get('news', {})
+        self.news_crawler = NewsCrawler(
+            source=data_source,
+            crawler=AsyncCrawler.from_config(news_config, source=data_source),
+            max_pages=news_config.get('max_pages', DEFAULT_MAX_PAGES),
+            page_batch=news_config.get('page_batch', DEFAULT_PAGE_BATCH),
+            dedup_index=NearDuplicateIndex(
+                retention_days=news_config.get('dedup_retention_days', DEFAULT_RETENTION_DAYS)
+            )
+        )
+        self.analyzer = StockAnalyzer(ticker_master=self.stock_collector.ticker_master)
+        # 5/20/60일 투자자 수급 누적 (실행 간 상태 유지)
+        self.flow_tracker = InvestorFlowTracker()
         self.report_generator = ReportGenerator()
         
         self._setup_jobs()
@@ -60,7 +94,21 @@ class DailyScheduler:
     
     def generate_daily_report(self):
         """현재 날짜의 보고서 생성"""
-        self.generate_daily_report_for_date(datetime.now(KST))
+        now = datetime.now(KST)
+        self._refresh_trading_calendar(now)
+        self.generate_daily_report_for_date(now)
+    
+    def _refresh_trading_calendar(self, date: datetime):
+        """최근 KRX 영업일과 대조해 휴장일 데이터에 없는 임시공휴일 등을 보정"""
+        calendar_config = self.config.get('calendar', {})
+        if not calendar_config.get('refresh_from_krx', False):
+            return
+        
+        try:
+            start = date - timedelta(days=calendar_config.get('refresh_days', 30))
+            get_trading_calendar().refresh_from_krx(self.stock_collector.source, start, date)
+        except Exception as e:
+            logger.warning(f"거래일 캘린더 보정 실패: {e}")
     
     def generate_daily_report_for_date(self, target_date):
         """특정 날짜의 보고서 생성"""
@@ -115,10 +163,12 @@ class DailyScheduler:
             
             # 종목 리스트 수집
             logger.info("종목 리스트 수집 중...")
-            tickers = self.stock_collector.get_stock_list("ALL")
+            tickers = self.stock_collector.get_stock_list("ALL", date)
             
             # 주식 데이터 수집 (메모리 고려하여 배치 처리)
+            # 전종목 시세는 스냅샷으로 한 번만 받고 각 배치는 이를 잘라서 사용
             logger.info(f"주식 데이터 수집 중... ({len(tickers)}개 종목)")
+            self.stock_collector.get_market_snapshot(date)
             batch_size = 500
             all_stock_data = []
             
@@ -135,11 +185,31 @@ class DailyScheduler:
             else:
                 data['stock_data'] = pd.DataFrame()
             
+            # 업종 지수 (시장별 벌크 조회)
+            logger.info("업종 지수 데이터 수집 중...")
+            data['sector_data'] = self.stock_collector.get_sector_data(date)
+            
             # 투자자별 거래 데이터 수집
             logger.info("투자자별 거래 데이터 수집 중...")
             data['investor_data'] = self.investor_collector.get_investor_trading_data(date)
             data['hourly_investor_data'] = self.investor_collector.get_hourly_investor_data(date)
             
+            # 투자자 수급 누적 갱신
+            data['flow_trend'] = self._update_flow_trend(date, data['investor_data'])
+            
+            # 종목별 투자자 순매수 (시장 × 투자자 벌크 조회) 결합
+            net_purchases = self.investor_collector.get_ticker_net_purchases(date)
+            data['stock_data'] = self.investor_collector.join_net_purchases(data['stock_data'], net_purchases)
+            
+            # 프로그램 매매 / 공매도 (시장별 벌크 조회)
+            logger.info("프로그램 매매 및 공매도 데이터 수집 중...")
+            data['program_trading'] = self.investor_collector.get_program_trading_data(date)
+            data['short_selling'] = self.short_collector.get_short_selling_data(date)
+            
+            # 외국인 지분율 / 한도 소진율 (1일, 5일, 20일 변화)
+            logger.info("외국인 보유 데이터 수집 중...")
+            data['foreign_ownership'] = self.foreign_collector.get_exhaustion_deltas(date)
+            
             # 뉴스 데이터 수집
             logger.info("뉴스 데이터 수집 중...")
             data['news_data'] = self.news_crawler.get_market_news(date)
@@ -151,6 +221,31 @@ class DailyScheduler:
         
         return data
     
+    def _update_flow_trend(self, date: datetime, investor_data: dict) -> dict:
+        """확정된 투자자 데이터로 누적 수급 상태를 갱신하고 리포트용 요약 반환"""
+        date_str = date.strftime('%Y%m%d')
+        
+        try:
+            if self.investor_collector.is_final(date):
+                # 직전 실행 이후 빠진 거래일은 기간 조회 1회로 채운 뒤 순서대로 반영
+                missing = self.flow_tracker.missing_dates(date_str)
+                if missing:
+                    logger.info(f"수급 누적 누락 거래일 보충: {missing[0]} ~ {missing[-1]} ({len(missing)}일)")
+                    first, last = (KST.localize(datetime.strptime(d, '%Y%m%d')) for d in (missing[0], missing[-1]))
+                    self.investor_collector.prefetch_investor_range(first, last)
+                    for day_str in missing:
+                        day = KST.localize(datetime.strptime(day_str, '%Y%m%d'))
+                        self.flow_tracker.update(day_str, self.investor_collector.get_investor_trading_data(day))
+                
+                if self.flow_tracker.update(date_str, investor_data):
+                    self.flow_tracker.save()
+            
+            return self.flow_tracker.summary(date_str) or {}
+            
+        except Exception as e:
+            logger.warning(f"수급 누적 갱신 실패: {e}")
+            return {}
+    
     def _analyze_data(self, data: dict) -> dict:
         try:
             stock_data = data.get('stock_data', pd.DataFrame())
@@ -164,19 +259,49 @@ class DailyScheduler:
                     'surge_stocks': [],
                     'plunge_stocks': [],
                     'themes': [],
-                    'market_sentiment': {}
+                    'market_sentiment': {},
+                    'top_net_buys': {'foreign': [], 'institution': []},
+                    'sector_flows': {'sectors': [], 'mega_sectors': []},
+                    'sector_indices': self.analyzer.analyze_sector_indices(data.get('sector_data')),
+                    'program_trading': data.get('program_trading', {}),
+                    'short_selling_top': [],
+                    'foreign_ownership_top': [],
+                    'flow_trend': data.get('flow_trend', {})
                 }
             
             # 급등/급락 종목 분석
             surge_stocks = self.analyzer.analyze_surge_stocks(stock_data)
             plunge_stocks = self.analyzer.analyze_plunge_stocks(stock_data)
             
+            # 급등/급락 종목 뉴스 (동시 수집, 데드라인 내 부분 결과)
+            movers = {stock['ticker']: stock['name'] for stock in surge_stocks + plunge_stocks}
+            related_news = self.news_crawler.get_stocks_related_news(
+                movers, deadline=self.config.get('news', {}).get('stock_news_deadline')
+            )
+            surge_stocks = self.analyzer.attach_news_reasons(surge_stocks, related_news)
+            plunge_stocks = self.analyzer.attach_news_reasons(plunge_stocks, related_news)
+            
             # 테마 분석
             themes = self.analyzer.identify_themes(surge_stocks)
             
             # 시장 심리 분석
             market_sentiment = self.analyzer.calculate_market_sentiment(stock_data)
             
+            # 외국인/기관 순매수 상위 종목
+            top_net_buys = self.analyzer.analyze_top_net_buys(stock_data)
+            
+            # 섹터별 투자자 수급 (리포트 데이터와 함께 저장)
+            sector_flows = self.analyzer.analyze_sector_flows(stock_data)
+            
+            # 업종 지수 등락 상위/하위
+            sector_indices = self.analyzer.analyze_sector_indices(data.get('sector_data'))
+            
+            # 공매도 비중 상위 종목
+            short_selling_top = self.analyzer.analyze_heavy_short_selling(data.get('short_selling'), stock_data)
+            
+            # 외국인 지분율 증가 상위 종목
+            foreign_ownership_top = self.analyzer.analyze_foreign_ownership(data.get('foreign_ownership'))
+            
             return {
                 'market_data': data.get('market_data', {}),
                 'investor_data': data.get('hourly_investor_data', {}),
@@ -185,6 +310,13 @@ class DailyScheduler:
                 'plunge_stocks': plunge_stocks,
                 'themes': themes,
                 'market_sentiment': market_sentiment,
+                'top_net_buys': top_net_buys,
+                'sector_flows': sector_flows,
+                'sector_indices': sector_indices,
+                'program_trading': data.get('program_trading', {}),
+                'short_selling_top': short_selling_top,
+                'foreign_ownership_top': foreign_ownership_top,
+                'flow_trend': data.get('flow_trend', {}),
                 'news_data': data.get('news_data', [])
             }
             
@@ -217,6 +349,85 @@ class DailyScheduler:
             logger.info("수동으로 일일 보고서 생성을 시작합니다.")
             self.generate_daily_report()
     
+    def backfill(self, from_date: str, to_date: str, workers: int = None) -> List[str]:
+        """기간 보고서 일괄 생성 (수집은 기간 조회로 묶고 렌더링은 프로세스 풀에서 병렬 처리)"""
+        try:
+            start = KST.localize(datetime.strptime(from_date, "%Y-%m-%d"))
+            end = KST.localize(datetime.strptime(to_date, "%Y-%m-%d"))
+        except ValueError:
+            logger.error(f"잘못된 날짜 형식: {from_date} ~ {to_date}. YYYY-MM-DD 형식을 사용하세요.")
+            raise
+        
+        if start > end:
+            raise ValueError(f"시작일이 종료일보다 늦습니다: {from_date} > {to_date}")
+        
+        calendar = get_trading_calendar()
+        trading_days = [KST.localize(day.to_pydatetime()) for day in calendar.between(start, end)]
+        
+        if not trading_days:
+            logger.info(f"{from_date} ~ {to_date} 기간에 거래일이 없습니다.")
+            return []
+        
+        logger.info(f"백필 시작: {from_date} ~ {to_date} ({len(trading_days)} 거래일)")
+        
+        # 누적 수급 창을 채울 기간 이전 거래일 (오래된 순)
+        live_tracker = self.flow_tracker
+        warmup_days = [KST.localize(day.to_pydatetime())
+                       for day in calendar.recent(calendar.previous(trading_days[0]), live_tracker.capacity - 1)[::-1]]
+        
+        # 지수/투자자 데이터는 기간 조회로 한 번에 수집
+        range_start = get_previous_trading_day(trading_days[0])
+        self.stock_collector.prefetch_index_range(range_start, trading_days[-1])
+        self.investor_collector.prefetch_investor_range(warmup_days[0] if warmup_days else trading_days[0], trading_days[-1])
+        
+        # 저장된 누적 상태는 최신일 기준이라 과거 날짜의 창을 만들 수 없으므로
+        # 백필마다 저장하지 않는 새 트래커에 날짜순으로 쌓아 계산
+        self.flow_tracker = InvestorFlowTracker(state_path=None, windows=live_tracker.windows,
+                                                investors=live_tracker.investors)
+        for day in warmup_days:
+            self.flow_tracker.update(day.strftime('%Y%m%d'), self.investor_collector.get_investor_trading_data(day))
+        
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        
+        try:
+            html_paths = self._backfill_reports(trading_days, workers)
+        finally:
+            self.flow_tracker = live_tracker
+        
+        logger.info(f"백필 완료: {len(html_paths)}/{len(trading_days)}개 보고서 생성")
+        return sorted(html_paths)
+    
+    def _backfill_reports(self, trading_days: List[datetime], workers: int) -> List[str]:
+        """거래일 순서대로 수집/분석하고 렌더링은 프로세스 풀에 넘김"""
+        html_paths = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for target_date in trading_days:
+                # 수집은 캐시/저장소를 공유하도록 순서대로 (전일 스냅샷 재사용)
+                logger.info(f"{target_date.strftime('%Y-%m-%d')} 데이터 수집 및 분석 중...")
+                try:
+                    report_data = self._collect_all_data(target_date)
+                    analyzed_data = self._analyze_data(report_data)
+                except Exception as e:
+                    logger.error(f"{target_date.strftime('%Y-%m-%d')} 데이터 준비 실패: {e}")
+                    continue
+                
+                future = executor.submit(
+                    _render_report_job, analyzed_data, target_date,
+                    self.report_generator.template_dir, self.report_generator.output_dir
+                )
+                futures[future] = target_date
+            
+            for future in as_completed(futures):
+                target_date = futures[future]
+                try:
+                    html_paths.append(future.result())
+                except Exception as e:
+                    logger.error(f"{target_date.strftime('%Y-%m-%d')} 보고서 렌더링 실패: {e}")
+        
+        return html_paths
+    
     def start(self):
         """스케줄러 시작"""
         logger.info("일일 주식 보고서 스케줄러를 시작합니다.")
@@ -0,0 +1,171 @@
+"""
+다중 키워드 매칭 (Aho-Corasick)
+시장 키워드, 감성(긍정/부정) 키워드, 테마 키워드 사전 전체로 오토마톤을 한 번 만들고
+뉴스 제목이나 종목명을 한 번만 훑어 키워드, 감성 점수, 테마를 함께 구한다.
+키워드 수와 관계없이 텍스트 길이에 비례하는 시간으로 매칭한다.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import threading
+
+# 시장 관련 키워드 (뉴스 키워드 추출)
+MARKET_KEYWORDS = [
+    '급등', '급락', '상승', '하락', '매수', '매도',
+    '실적', '분기', '영업이익', '매출',
+    '공시', '발표', '계약', '투자',
+    '테마', '관련주', '동반상승', '동반하락',
+    '외국인', '기관', '개인투자자',
+    '코스피', '코스닥', '지수'
+]
+
+# 감성 키워드 (뉴스 제목 긍정/부정 판단)
+POSITIVE_KEYWORDS = ['상승', '급등', '호재', '실적 개선', '매수', '투자 확대']
+NEGATIVE_KEYWORDS = ['하락', '급락', '악재', '실적 악화', '매도', '투자 축소']
+
+# 특별 테마 키워드 (종목명 기반 테마)
+THEME_KEYWORDS = {
+    'AI/ChatGPT': ['AI', '인공지능', 'ChatGPT', '챗GPT', '생성AI'],
+    'K-컬처': ['한류', 'BTS', 'K-POP', '웹툰', 'OTT'],
+    '메타버스': ['메타버스', 'VR', 'AR', '가상현실'],
+    '수소경제': ['수소', '연료전지', '그린수소'],
+    '우주항공': ['우주', '위성', '발사체', '항공우주'],
+    '탄소중립': ['ESG', '친환경', '태양광', '풍력'],
+    '국방': ['방산', '국방', '무기', '방위산업']
+}
+
+class AhoCorasick:
+    """문자열 패턴 집합의 Aho-Corasick 오토마톤. 패턴마다 임의의 태그 목록을 붙일 수 있다."""
+
+    def __init__(self, patterns: Dict[str, List]):
+        # 노드별 전이, 실패 링크, 출력 (해당 노드에서 끝나는 패턴 — 실패 링크를 따라 병합)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        self.tags: Dict[str, List] = {}
+
+        for pattern, tags in patterns.items():
+            if pattern:
+                self._add(pattern)
+                self.tags[pattern] = list(tags)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(pattern)
+
+    def _build_failure_links(self):
+        # 깊이 1 노드의 실패 링크는 루트, 이후 BFS 순서로 계산
+        queue = deque(self._goto[0].values())
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        # 실패 링크를 미리 펼친 전이표: 문자 하나당 딕셔너리 조회 한 번으로 다음 상태 결정
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+        for node in order:
+            self._delta[node] = {**self._delta[self._fail[node]], **self._goto[node]}
+
+    def find_patterns(self, text: str) -> set:
+        """텍스트에 한 번 이상 등장한 패턴 집합"""
+        delta, output = self._delta, self._output
+        found = set()
+        node = 0
+        for char in text:
+            node = delta[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+class KeywordHits:
+    def __init__(self, keywords: List[str], positive: int, negative: int, themes: List[str]):
+        self.keywords = keywords
+        self.positive = positive
+        self.negative = negative
+        self.themes = themes
+
+    @property
+    def sentiment(self) -> str:
+        if self.positive > self.negative:
+            return 'positive'
+        if self.negative > self.positive:
+            return 'negative'
+        return 'neutral'
+
+
+class KeywordMatcher:
+    """모든 키워드 사전을 합친 단일 오토마톤"""
+
+    def __init__(self, market_keywords: List[str] = None, positive_keywords: List[str] = None,
+                 negative_keywords: List[str] = None, theme_keywords: Dict[str, List[str]] = None):
+        self.market_keywords = list(market_keywords or MARKET_KEYWORDS)
+        self.theme_keywords = dict(theme_keywords or THEME_KEYWORDS)
+        # 결과 순서를 사전 순서와 맞추기 위한 순번
+        self._keyword_order = {keyword: i for i, keyword in enumerate(self.market_keywords)}
+        self._theme_order = {theme: i for i, theme in enumerate(self.theme_keywords)}
+
+        # 패턴 → (분류, 라벨) 태그 목록. 같은 단어가 여러 사전에 있어도 한 번만 매칭
+        patterns: Dict[str, List[Tuple[str, str]]] = {}
+        for keyword in self.market_keywords:
+            patterns.setdefault(keyword, []).append(('market', keyword))
+        for keyword in positive_keywords or POSITIVE_KEYWORDS:
+            patterns.setdefault(keyword, []).append(('positive', keyword))
+        for keyword in negative_keywords or NEGATIVE_KEYWORDS:
+            patterns.setdefault(keyword, []).append(('negative', keyword))
+        for theme, keywords in self.theme_keywords.items():
+            for keyword in keywords:
+                patterns.setdefault(keyword, []).append(('theme', theme))
+        self.automaton = AhoCorasick(patterns)
+
+    def scan(self, text: str) -> KeywordHits:
+        """텍스트를 한 번 훑어 시장 키워드, 긍정/부정 키워드 수, 테마를 반환"""
+        keywords, themes = set(), set()
+        positive = negative = 0
+        for pattern in self.automaton.find_patterns(text or ''):
+            for category, label in self.automaton.tags[pattern]:
+                if category == 'market':
+                    keywords.add(label)
+                elif category == 'positive':
+                    positive += 1
+                elif category == 'negative':
+                    negative += 1
+                else:
+                    themes.add(label)
+
+        return KeywordHits(
+            sorted(keywords, key=self._keyword_order.get),
+            positive,
+            negative,
+            sorted(themes, key=self._theme_order.get)
+        )
+
+
+_matcher: Optional[KeywordMatcher] = None
+_matcher_lock = threading.Lock()
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """프로세스 전역 매처 (최초 호출 시 한 번만 생성)"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = KeywordMatcher()
+    return _matcher
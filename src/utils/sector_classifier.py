@@ -4,7 +4,9 @@ WICS(World Industry Classification Standard) 기반 한국형 분류
 """
 
 import logging
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Tuple
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -201,11 +203,36 @@ class SectorClassifier:
                 'name_patterns': ['방산', '국방', '군수', 'defense']
             }
         }
+        
+        # 상세 섹터 → 메가 섹터 (여러 메가 섹터에 속하면 먼저 나온 쪽)
+        self._mega_lookup: Dict[str, str] = {}
+        for mega, details in self.mega_sectors.items():
+            for detail in details:
+                self._mega_lookup.setdefault(detail, mega)
+        
+        # (티커, 회사명) → 상세 섹터 분류 결과
+        self._sector_cache: Dict[Tuple[str, str], str] = {}
+        self._cache_lock = threading.Lock()
     
     def classify_sector(self, ticker: str, company_name: str) -> str:
         """
-        종목 코드와 회사명을 기반으로 고도화된 섹터 분류
+        종목 코드와 회사명을 기반으로 고도화된 섹터 분류 (결과는 메모)
         """
+        key = (ticker, company_name)
+        sector = self._sector_cache.get(key)
+        if sector is None:
+            sector = self._classify_sector(ticker, company_name)
+            with self._cache_lock:
+                self._sector_cache[key] = sector
+        return sector
+    
+    def classify_many(self, tickers: pd.Series, company_names: pd.Series) -> pd.Series:
+        """여러 종목을 한 번에 분류 (중복 (티커, 회사명)은 한 번만 분류)"""
+        keys = list(zip(tickers.astype(str), company_names.astype(str)))
+        sectors = {key: self.classify_sector(*key) for key in dict.fromkeys(keys)}
+        return pd.Series([sectors[key] for key in keys], index=tickers.index, name='sector')
+    
+    def _classify_sector(self, ticker: str, company_name: str) -> str:
         try:
             # 1. 특정 대형주 직접 매핑 (대폭 확장)
             large_cap_mapping = {
@@ -362,10 +389,7 @@ class SectorClassifier:
     
     def get_mega_sector(self, detailed_sector: str) -> str:
         """상세 섹터에서 메가 섹터 반환"""
-        for mega, details in self.mega_sectors.items():
-            if detailed_sector in details:
-                return mega
-        return '기타'
+        return self._mega_lookup.get(detailed_sector, '기타')
     
     def get_sector_description(self, sector: str) -> str:
         """섹터 설명 반환"""
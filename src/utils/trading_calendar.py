@@ -0,0 +1,261 @@
+"""
+KRX 거래일 캘린더
+휴장일 데이터 파일(config/krx_holidays.json)로 한 번 만들어 두고
+날짜를 서수(ordinal) 정수로 바꿔 조회한다.
+
+- 거래일 비트맵: 거래일 여부 O(1) 조회
+- 정렬된 거래일 서수 배열: np.searchsorted로 이전/다음/N거래일 전, 기간 내 거래일 벡터 조회
+
+데이터 파일 범위 밖의 연도는 주말만 제외하며, refresh_from_krx()로
+KRX 실제 영업일과 대조해 임시공휴일 등을 보정할 수 있다.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Union
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_HOLIDAY_PATH = os.path.join(_PROJECT_ROOT, 'config', 'krx_holidays.json')
+DEFAULT_OVERRIDE_PATH = os.path.join(_PROJECT_ROOT, 'data', 'trading_calendar', 'krx_overrides.json')
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DateLike = Union[datetime, date, str, np.datetime64, pd.Timestamp]
+
+def _to_ordinal(value: DateLike) -> int:
+    if isinstance(value, (datetime, date)):
+        return value.toordinal()
+    return pd.Timestamp(value).toordinal()
+
+def _to_ordinals(values: Iterable[DateLike]) -> np.ndarray:
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        # 시간대가 있는 값은 해당 시간대의 달력 날짜 기준
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]').astype(np.int64) + _EPOCH_ORDINAL
+
+def _to_index(ordinals: np.ndarray) -> pd.DatetimeIndex:
+    days = (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype('datetime64[D]')
+    return pd.DatetimeIndex(days.astype('datetime64[ns]'))
+
+def _is_scalar(value) -> bool:
+    return isinstance(value, (datetime, date, str, np.datetime64))
+
+def _shift(value: DateLike, days: int):
+    """스칼라 입력의 형식(시간대, 시각 포함)을 유지한 채 날짜만 이동"""
+    if isinstance(value, (datetime, date)):
+        return value + timedelta(days=days)
+    return pd.Timestamp(value) + pd.Timedelta(days=days)
+
+
+class TradingCalendar:
+    def __init__(self, holiday_path: str = None, override_path: str = None):
+        self.holiday_path = holiday_path or DEFAULT_HOLIDAY_PATH
+        self.override_path = override_path or DEFAULT_OVERRIDE_PATH
+        self._lock = threading.Lock()
+
+        self.holidays: Dict[int, str] = {}
+        self._overrides = {'closed': set(), 'open': set()}
+        first_year, last_year = self._load_holidays()
+        self._load_overrides()
+
+        self._data_years = (first_year, last_year)
+        self._build(date(first_year, 1, 1).toordinal(), date(last_year, 12, 31).toordinal())
+
+    # 조회
+
+    def is_trading_day(self, value: DateLike) -> bool:
+        ordinal = _to_ordinal(value)
+        start, bitmap, _ = self._ensure_range(ordinal, ordinal)
+        return bool(bitmap[ordinal - start])
+
+    def previous(self, value, n: int = 1):
+        """n거래일 전 (해당일 제외). 스칼라는 입력 형식 유지, 배열은 DatetimeIndex"""
+        return self.n_back(value, n)
+
+    def n_back(self, value, n: int):
+        if n < 1:
+            raise ValueError(f"n은 1 이상이어야 합니다: {n}")
+        return self._step(value, -n)
+
+    def next(self, value, n: int = 1):
+        """n거래일 후 (해당일 제외). 스칼라는 입력 형식 유지, 배열은 DatetimeIndex"""
+        if n < 1:
+            raise ValueError(f"n은 1 이상이어야 합니다: {n}")
+        return self._step(value, n)
+
+    def between(self, start: DateLike, end: DateLike) -> pd.DatetimeIndex:
+        """start~end(양끝 포함) 사이의 거래일"""
+        lo, hi = _to_ordinal(start), _to_ordinal(end)
+        if lo > hi:
+            return pd.DatetimeIndex([])
+        _, _, trading = self._ensure_range(lo, hi)
+        return _to_index(trading[np.searchsorted(trading, lo, 'left'):np.searchsorted(trading, hi, 'right')])
+
+    def recent(self, value: DateLike, n: int) -> pd.DatetimeIndex:
+        """기준일(거래일이면 포함)부터 거슬러 올라간 최근 n거래일 (최신순)"""
+        ordinal = _to_ordinal(value)
+        _, _, trading = self._ensure_range(ordinal - 2 * n - 30, ordinal)
+        end = np.searchsorted(trading, ordinal, 'right')
+        return _to_index(trading[max(0, end - n):end][::-1])
+
+    # 보정
+
+    def refresh_from_krx(self, source, start: DateLike, end: DateLike, save: bool = True) -> int:
+        """KRX 영업일 목록과 대조해 start~end의 휴장일을 보정. 변경된 날짜 수를 반환"""
+        lo, hi = _to_ordinal(start), _to_ordinal(end)
+        business_days = source.pykrx(
+            'get_previous_business_days',
+            fromdate=_to_index([lo])[0].strftime('%Y%m%d'),
+            todate=_to_index([hi])[0].strftime('%Y%m%d')
+        )
+        if len(business_days) == 0:
+            logger.warning(f"KRX 영업일 조회 결과 없음: {start} ~ {end}")
+            return 0
+
+        open_days = set(int(o) for o in _to_ordinals(business_days))
+        # 조회 결과는 마지막 영업일까지만 유효
+        hi = min(hi, max(open_days))
+
+        with self._lock:
+            changed = 0
+            for ordinal in range(lo, hi + 1):
+                if date.fromordinal(ordinal).weekday() >= 5:
+                    continue
+                is_open = ordinal in open_days
+                if is_open == self._is_open_by_data(ordinal):
+                    continue
+                changed += 1
+                self._overrides['open' if is_open else 'closed'].add(ordinal)
+                self._overrides['closed' if is_open else 'open'].discard(ordinal)
+
+            if changed:
+                start, bitmap, _ = self._state
+                self._build(start, start + len(bitmap) - 1)
+
+        if changed:
+            logger.info(f"거래일 캘린더 보정: {changed}일 변경")
+            if save:
+                self._save_overrides()
+        return changed
+
+    # 내부 구현
+
+    def _is_open_by_data(self, ordinal: int) -> bool:
+        if ordinal in self._overrides['closed']:
+            return False
+        if ordinal in self._overrides['open']:
+            return True
+        return date.fromordinal(ordinal).weekday() < 5 and ordinal not in self.holidays
+
+    def _build(self, start: int, end: int):
+        ordinals = np.arange(start, end + 1, dtype=np.int64)
+        # 0001-01-01(서수 1)은 월요일
+        bitmap = (ordinals - 1) % 7 < 5
+
+        closed = set(self.holidays) | self._overrides['closed']
+        closed_idx = np.fromiter((o - start for o in closed if start <= o <= end), dtype=np.int64)
+        bitmap[closed_idx] = False
+        open_idx = np.fromiter((o - start for o in self._overrides['open'] if start <= o <= end),
+                               dtype=np.int64)
+        bitmap[open_idx] = True
+
+        # 조회 스레드가 일관된 (시작 서수, 비트맵, 거래일 배열)을 보도록 한 번에 교체
+        self._state = (start, bitmap, ordinals[bitmap])
+
+    def _ensure_range(self, lo: int, hi: int):
+        """lo~hi 서수를 포함하도록 캘린더 범위를 확장하고 현재 상태를 반환"""
+        state = self._state
+        start, end = state[0], state[0] + len(state[1]) - 1
+        if start <= lo and hi <= end:
+            return state
+
+        with self._lock:
+            state = self._state
+            start, end = state[0], state[0] + len(state[1]) - 1
+            if start <= lo and hi <= end:
+                return state
+            new_start = min(start, date(date.fromordinal(lo).year, 1, 1).toordinal())
+            new_end = max(end, date(date.fromordinal(hi).year, 12, 31).toordinal())
+            first, last = self._data_years
+            logger.warning(f"휴장일 데이터 범위({first}~{last}년) 밖의 날짜 조회: 해당 연도는 주말만 제외합니다.")
+            self._build(new_start, new_end)
+            return self._state
+
+    def _step(self, value, offset: int):
+        scalar = _is_scalar(value)
+        ordinals = np.array([_to_ordinal(value)], dtype=np.int64) if scalar else _to_ordinals(value)
+        if len(ordinals) == 0:
+            return pd.DatetimeIndex([])
+
+        margin = 2 * abs(offset) + 30
+        _, _, trading = self._ensure_range(int(ordinals.min()) - margin, int(ordinals.max()) + margin)
+
+        if offset < 0:
+            positions = np.searchsorted(trading, ordinals, 'left') + offset
+        else:
+            positions = np.searchsorted(trading, ordinals, 'right') + offset - 1
+        result = trading[positions]
+
+        if scalar:
+            return _shift(value, int(result[0] - ordinals[0]))
+        return _to_index(result)
+
+    def _load_holidays(self):
+        today = date.today()
+        try:
+            with open(self.holiday_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"휴장일 데이터 로드 실패 ({self.holiday_path}): {e}. 주말만 제외합니다.")
+            return today.year, today.year
+
+        for year_holidays in data.get('holidays', {}).values():
+            for day, name in year_holidays.items():
+                self.holidays[date.fromisoformat(day).toordinal()] = name
+
+        first_year, last_year = data.get('years', [today.year, today.year])
+        return int(first_year), int(last_year)
+
+    def _load_overrides(self):
+        if not os.path.exists(self.override_path):
+            return
+        try:
+            with open(self.override_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key in ('closed', 'open'):
+                self._overrides[key] = {date.fromisoformat(day).toordinal() for day in data.get(key, [])}
+        except Exception as e:
+            logger.warning(f"거래일 보정 데이터 로드 실패 ({self.override_path}): {e}")
+
+    def _save_overrides(self):
+        data = {key: sorted(date.fromordinal(o).isoformat() for o in ordinals)
+                for key, ordinals in self._overrides.items()}
+        tmp_path = f"{self.override_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.override_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.override_path)
+        except Exception as e:
+            logger.warning(f"거래일 보정 데이터 저장 실패: {e}")
+
+
+_calendar: Optional[TradingCalendar] = None
+_calendar_lock = threading.Lock()
+
+def get_trading_calendar() -> TradingCalendar:
+    """프로세스 전역 캘린더 (최초 호출 시 한 번만 생성)"""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = TradingCalendar()
+    return _calendar
@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.scheduler.daily_scheduler import DailyScheduler
 from src.utils.market_utils import KST, is_trading_day, can_generate_today_report, is_market_closed
+from src.utils.trading_calendar import get_trading_calendar
 
 # 페이지 설정
 st.set_page_config(
@@ -281,14 +282,8 @@ with st.sidebar:
     st.markdown("### 📅 특정 날짜 리포트")
     
     # 최근 거래일 표시
-    trading_days = []
     today = datetime.now(KST)
-    for i in range(30):
-        date = today - timedelta(days=i)
-        if is_trading_day(date):
-            trading_days.append(date.date())
-            if len(trading_days) >= 10:
-                break
+    trading_days = [day.date() for day in get_trading_calendar().recent(today, 10)]
     
     selected_date = st.date_input(
         "날짜 선택",
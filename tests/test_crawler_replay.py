@@ -0,0 +1,46 @@
+from src.data_source.data_source import DataSource, HttpResponse, RecordingDataSource, ReplayDataSource
+from src.news_crawler.async_crawler import AsyncCrawler
+from src.news_crawler.http_cache import HttpCache
+
+
+class CountingSource(DataSource):
+    """URL마다 호출 횟수가 들어간 본문을 돌려주는 가짜 네트워크"""
+
+    def __init__(self):
+        self.calls = []
+
+    def call(self, namespace, func_name, url, **kwargs):
+        self.calls.append((url, kwargs))
+        body = f"{url} #{len(self.calls)}".encode('utf-8')
+        return HttpResponse(url, 200, {'ETag': f'"{len(self.calls)}"'}, body, 'utf-8')
+
+
+URLS = {'a': 'https://example.com/a', 'b': 'https://example.com/b'}
+
+
+def crawl(crawler):
+    return {key: response.content for key, response in crawler.fetch_all(URLS).items()}
+
+
+def test_record_and_replay_same_crawl_with_cache_enabled(tmp_path):
+    fixture = str(tmp_path / 'fixture.pkl.gz')
+    cache = HttpCache(str(tmp_path / 'cache'), ttl=3600)
+
+    # 캐시에 이미 다른 응답이 있어도 기록 모드는 모든 요청을 실제 소스로 보냄
+    warm = AsyncCrawler(source=CountingSource(), cache=cache)
+    crawl(warm)
+
+    inner = CountingSource()
+    recorder = RecordingDataSource(fixture, inner=inner)
+    recorded = crawl(AsyncCrawler(source=recorder, cache=cache))
+    recorder.save()
+    assert len(inner.calls) == len(URLS)
+    assert all('If-None-Match' not in (kwargs.get('headers') or {}) for _, kwargs in inner.calls)
+
+    replay = ReplayDataSource(fixture)
+    replayed = crawl(AsyncCrawler(source=replay, cache=cache))
+    assert replayed == recorded
+    assert replay.misses == 0
+
+    # 같은 픽스처를 다시 재생해도 결과가 같음
+    assert crawl(AsyncCrawler(source=ReplayDataSource(fixture), cache=cache)) == recorded
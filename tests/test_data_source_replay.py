@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+import pytz
+
+from src.data_collector.index_master import IndexMaster
+from src.data_source.data_source import DataSource, DataSourceError, RecordingDataSource, ReplayDataSource
+
+KST = pytz.timezone('Asia/Seoul')
+DATE = KST.localize(datetime(2025, 3, 5))
+
+INDEX_NAMES = pd.Series({'1001': '코스피', '1028': '코스피 200', '2001': '코스닥', '2203': '코스닥 150'})
+
+
+class FakeKrx(DataSource):
+    """호출마다 값이 달라지는 가짜 pykrx (재생 결과가 기록 시점에 고정되는지 확인용)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, namespace, func_name, *args, **kwargs):
+        self.calls += 1
+        if func_name == 'get_index_ticker_list':
+            prefix = '1' if kwargs['market'] == 'KOSPI' else '2'
+            return [code for code in INDEX_NAMES.index if code.startswith(prefix)]
+        if func_name == 'get_index_ticker_name':
+            return INDEX_NAMES.loc[args[0]]
+        if func_name == 'get_market_ohlcv':
+            return pd.DataFrame({'종가': [70000 + self.calls]}, index=pd.Index(['005930'], name='티커'))
+        raise ValueError(f"알 수 없는 함수: {func_name}")
+
+
+def test_replay_returns_recorded_results_deterministically(tmp_path):
+    fixture = str(tmp_path / 'fixture.pkl.gz')
+    inner = FakeKrx()
+    recorder = RecordingDataSource(fixture, inner=inner)
+    recorded = recorder.pykrx('get_market_ohlcv', '20250305', market='ALL')
+    recorder.save()
+
+    # 실제 소스는 호출마다 다른 값을 주지만 재생은 기록된 값만 돌려줌
+    assert not inner.pykrx('get_market_ohlcv', '20250305', market='ALL').equals(recorded)
+    for _ in range(2):
+        replay = ReplayDataSource(fixture)
+        pd.testing.assert_frame_equal(replay.pykrx('get_market_ohlcv', '20250305', market='ALL'), recorded)
+        assert replay.misses == 0
+
+
+def test_collector_run_replays_without_network(tmp_path):
+    fixture = str(tmp_path / 'fixture.pkl.gz')
+    recorder = RecordingDataSource(fixture, inner=FakeKrx())
+    recorded = IndexMaster(data_dir=str(tmp_path / 'record'), source=recorder).ensure(DATE)
+    recorder.save()
+
+    replays = []
+    for run in range(2):
+        replay = ReplayDataSource(fixture)
+        replays.append(IndexMaster(data_dir=str(tmp_path / f'replay{run}'), source=replay).ensure(DATE))
+        assert replay.misses == 0
+
+    assert len(recorded) == len(INDEX_NAMES)
+    for table in replays:
+        pd.testing.assert_frame_equal(table, recorded)
+
+
+def test_fixture_key_normalizes_datetime_arguments(tmp_path):
+    fixture = str(tmp_path / 'fixture.pkl.gz')
+    recorder = RecordingDataSource(fixture, inner=FakeKrx())
+    recorder.pykrx('get_index_ticker_list', DATE, market='KOSPI')
+    recorder.save()
+
+    replay = ReplayDataSource(fixture)
+    assert replay.pykrx('get_index_ticker_list', KST.localize(datetime(2025, 3, 5)), market='KOSPI') == ['1001', '1028']
+
+
+def test_recorded_errors_and_unrecorded_calls_raise(tmp_path):
+    fixture = str(tmp_path / 'fixture.pkl.gz')
+    recorder = RecordingDataSource(fixture, inner=FakeKrx())
+    with pytest.raises(ValueError):
+        recorder.pykrx('get_unknown')
+    recorder.save()
+
+    replay = ReplayDataSource(fixture)
+    with pytest.raises(DataSourceError, match='ValueError'):
+        replay.pykrx('get_unknown')
+    assert replay.misses == 0
+
+    with pytest.raises(DataSourceError):
+        replay.pykrx('get_market_ohlcv', '20250306', market='ALL')
+    assert replay.misses == 1
@@ -0,0 +1,150 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+
+from src.data_source.data_source import DataSource, DataSourceError, HttpResponse, LiveDataSource
+from src.news_crawler.async_crawler import AsyncCrawler
+from src.news_crawler.http_cache import HttpCache
+
+URL = 'https://example.com/news'
+
+
+class ConditionalServer(DataSource):
+    """ETag 기반 조건부 요청을 처리하는 가짜 서버"""
+
+    def __init__(self, body=b'v1', etag='"v1"', last_modified='Wed, 05 Mar 2025 06:00:00 GMT'):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.status_code = 200
+        self.requests = []
+
+    def call(self, namespace, func_name, url, **kwargs):
+        headers = kwargs.get('headers') or {}
+        self.requests.append(headers)
+        if self.status_code != 200:
+            return HttpResponse(url, self.status_code, {}, b'error', 'utf-8')
+        if headers.get('If-None-Match') == self.etag:
+            return HttpResponse(url, 304, {'ETag': self.etag, 'Date': 'revalidated'}, b'', None)
+        return HttpResponse(url, 200, {'ETag': self.etag, 'Last-Modified': self.last_modified},
+                            self.body, 'utf-8')
+
+
+def fetch(crawler):
+    return crawler.fetch_all({'news': URL})['news']
+
+
+def test_fresh_entry_is_served_without_request(tmp_path):
+    server = ConditionalServer()
+    crawler = AsyncCrawler(source=server, cache=HttpCache(str(tmp_path), ttl=3600))
+
+    assert fetch(crawler).content == b'v1'
+    assert fetch(crawler).content == b'v1'
+    assert len(server.requests) == 1
+
+
+def test_stale_entry_is_revalidated_and_304_reuses_body(tmp_path):
+    server = ConditionalServer()
+    cache = HttpCache(str(tmp_path), ttl=0)
+    crawler = AsyncCrawler(source=server, cache=cache)
+
+    fetch(crawler)
+    first_fetched_at = cache.get(URL).fetched_at
+
+    response = fetch(crawler)
+    assert server.requests[-1] == {'If-None-Match': '"v1"',
+                                   'If-Modified-Since': 'Wed, 05 Mar 2025 06:00:00 GMT'}
+    # 304는 저장된 본문을 200 응답으로 돌려주고 수신 시각과 헤더만 갱신
+    assert (response.status_code, response.content, response.encoding) == (200, b'v1', 'utf-8')
+    entry = cache.get(URL)
+    assert entry.content == b'v1'
+    assert entry.headers['Date'] == 'revalidated'
+    assert entry.fetched_at >= first_fetched_at
+
+
+def test_changed_resource_replaces_cached_body(tmp_path):
+    server = ConditionalServer()
+    cache = HttpCache(str(tmp_path), ttl=0)
+    crawler = AsyncCrawler(source=server, cache=cache)
+    fetch(crawler)
+
+    server.body, server.etag = b'v2', '"v2"'
+    assert fetch(crawler).content == b'v2'
+    assert server.requests[-1]['If-None-Match'] == '"v1"'
+    assert (cache.get(URL).content, cache.get(URL).etag) == (b'v2', '"v2"')
+
+
+def test_error_responses_are_not_cached(tmp_path):
+    server = ConditionalServer()
+    server.status_code = 500
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    crawler = AsyncCrawler(source=server, cache=cache)
+
+    with pytest.raises(DataSourceError):
+        crawler.get(URL)
+    assert cache.get(URL) is None
+
+
+def test_stale_entry_is_used_when_revalidation_fails(tmp_path):
+    server = ConditionalServer()
+    cache = HttpCache(str(tmp_path), ttl=0)
+    fetch(AsyncCrawler(source=server, cache=cache))
+
+    class Offline(DataSource):
+        def call(self, namespace, func_name, url, **kwargs):
+            raise ConnectionError('offline')
+
+    assert fetch(AsyncCrawler(source=Offline(), cache=cache)).content == b'v1'
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """127.0.0.1 로컬 서버: If-None-Match가 현재 ETag와 같으면 본문 없는 304"""
+    body = b'<html>v1</html>'
+    etag = '"v1"'
+    seen_headers = []
+
+    def do_GET(self):
+        type(self).seen_headers.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', self.etag)
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    ConditionalHandler.seen_headers = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ConditionalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/news"
+    server.shutdown()
+    server.server_close()
+
+
+def test_live_source_revalidates_against_local_server(tmp_path, local_server):
+    cache = HttpCache(str(tmp_path), ttl=0)
+    crawler = AsyncCrawler(source=LiveDataSource(), cache=cache)
+
+    first = crawler.get(local_server)
+    assert (first.status_code, first.content) == (200, b'<html>v1</html>')
+    assert 'If-None-Match' not in ConditionalHandler.seen_headers[0]
+    first_fetched_at = cache.get(local_server).fetched_at
+
+    # 조건부 헤더가 실제 요청에 실리고, 본문 없는 304가 캐시 본문으로 바뀌어 돌아옴
+    second = crawler.get(local_server)
+    assert ConditionalHandler.seen_headers[1]['If-None-Match'] == '"v1"'
+    assert (second.status_code, second.content, second.encoding) == (200, b'<html>v1</html>', 'utf-8')
+    assert cache.get(local_server).fetched_at >= first_fetched_at
+    assert len(ConditionalHandler.seen_headers) == 2
@@ -0,0 +1,49 @@
+import random
+
+from src.utils.keyword_matcher import (
+    MARKET_KEYWORDS, NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS, THEME_KEYWORDS, AhoCorasick, KeywordMatcher
+)
+
+
+def naive_scan(text):
+    """키워드마다 `in`으로 찾는 기존 방식"""
+    keywords = [keyword for keyword in MARKET_KEYWORDS if keyword in text]
+    positive = sum(1 for keyword in POSITIVE_KEYWORDS if keyword in text)
+    negative = sum(1 for keyword in NEGATIVE_KEYWORDS if keyword in text)
+    themes = [theme for theme, words in THEME_KEYWORDS.items() if any(word in text for word in words)]
+    return keywords, positive, negative, themes
+
+
+def random_titles(count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = (MARKET_KEYWORDS + POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS
+                  + [word for words in THEME_KEYWORDS.values() for word in words]
+                  + ['삼성전자', '카카오', '2차전지', '반도체', '발', '상', '급', 'A', 'I', ' ', ',', '…'])
+    return [''.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+def test_scan_matches_naive_search_on_random_titles():
+    matcher = KeywordMatcher()
+    for title in random_titles(2000):
+        hits = matcher.scan(title)
+        assert (hits.keywords, hits.positive, hits.negative, hits.themes) == naive_scan(title), title
+
+
+def test_overlapping_and_nested_patterns():
+    automaton = AhoCorasick({'he': [], 'she': [], 'his': [], 'hers': [], '': []})
+    assert automaton.find_patterns('ushers') == {'he', 'she', 'hers'}
+    assert automaton.find_patterns('') == set()
+
+    # '실적' 안에 '실적 개선'이 겹쳐도 각각 한 번씩 매칭
+    hits = KeywordMatcher().scan('AI 반도체 실적 개선에 외국인 매수, 코스피 상승')
+    assert hits.keywords == ['상승', '매수', '실적', '외국인', '코스피']
+    assert (hits.positive, hits.negative, hits.sentiment) == (3, 0, 'positive')
+    assert hits.themes == ['AI/ChatGPT']
+
+
+def test_empty_and_missing_text():
+    matcher = KeywordMatcher()
+    for text in ('', None):
+        hits = matcher.scan(text)
+        assert (hits.keywords, hits.positive, hits.negative, hits.themes) == ([], 0, 0, [])
+        assert hits.sentiment == 'neutral'
@@ -0,0 +1,93 @@
+from src.news_crawler.news_dedup import (
+    NearDuplicateIndex, normalize_title, remove_near_duplicates, title_fingerprint
+)
+
+
+def distance(a, b):
+    return bin(title_fingerprint(a) ^ title_fingerprint(b)).count('1')
+
+
+def titles(news_list):
+    return [news['title'] for news in news_list]
+
+
+def test_tag_and_press_variants_of_short_titles_are_duplicates():
+    assert normalize_title('[특징주] 삼성전자, 신고가 - 연합뉴스') == normalize_title('삼성전자 신고가')
+    assert distance('코스피 2,600 회복', '코스피 2,600 회복 (종합)') == 0
+
+    news = [
+        {'title': '삼성전자, 2분기 영업이익 10조 돌파'},
+        {'title': '[속보] 삼성전자, 2분기 영업이익 10조 돌파 - 연합뉴스'},
+        {'title': 'SK하이닉스, 신고가!'},
+        {'title': 'SK하이닉스 신고가'},
+    ]
+    assert titles(remove_near_duplicates(news, '20250305')) == [
+        '삼성전자, 2분기 영업이익 10조 돌파', 'SK하이닉스, 신고가!'
+    ]
+
+
+def test_short_titles_with_different_facts_are_kept():
+    # 짧은 제목은 한두 글자 차이도 3-gram 대부분을 바꿔 거리 임계값(3)을 크게 넘음
+    pairs = [
+        ('코스피 상승', '코스닥 상승'),
+        ('외국인 순매수 전환', '외국인 순매도 전환'),
+        ('삼성전자, 2분기 영업이익 10조 돌파', '삼성전자, 2분기 영업이익 9조 돌파'),
+    ]
+    for a, b in pairs:
+        assert distance(a, b) > 3
+        assert titles(remove_near_duplicates([{'title': a}, {'title': b}], '20250305')) == [a, b]
+
+
+def test_max_distance_is_inclusive_across_bands():
+    base = 0x0123_4567_89AB_CDEF
+    # 서로 다른 밴드의 비트를 뒤집어도 나머지 밴드 하나가 같아 후보로 잡힘
+    within = base ^ (1 << 0) ^ (1 << 16) ^ (1 << 32)
+    beyond = within ^ (1 << 48)
+
+    index = NearDuplicateIndex(state_path=None, max_distance=3)
+    index.add(base, '20250305')
+    assert index.find(within) == base
+    assert index.find(beyond) is None
+
+    strict = NearDuplicateIndex(state_path=None, max_distance=2)
+    strict.add(base, '20250305')
+    assert strict.find(within) is None
+
+
+def test_titles_seen_on_earlier_days_are_dropped_and_same_day_reruns_kept():
+    history = NearDuplicateIndex(state_path=None)
+    remove_near_duplicates([{'title': '코스피 2,600 회복'}], '20250304', history)
+
+    news = [{'title': '코스피 2,600 회복 (종합)'}, {'title': '코스닥 상승'}]
+    assert titles(remove_near_duplicates(news, '20250305', history)) == ['코스닥 상승']
+    # 같은 날 다시 실행하면 그날 기록된 기사는 유지
+    assert titles(remove_near_duplicates(news[1:], '20250305', history)) == ['코스닥 상승']
+
+
+def test_items_with_empty_normalized_title_are_kept():
+    news = [{'title': '[속보]'}, {'title': ''}, {'title': '(종합)'}, {'title': '코스피 상승'}]
+    assert titles(remove_near_duplicates(news, '20250305')) == ['[속보]', '', '(종합)', '코스피 상승']
+
+
+def test_backfilling_older_days_after_live_runs(tmp_path):
+    state_path = str(tmp_path / 'seen_index.json')
+    live = NearDuplicateIndex(state_path=state_path)
+    remove_near_duplicates([{'title': '코스닥 상승'}], '20251015', live)
+    live.save(as_of='20251015')
+
+    # 과거 기간 백필: 처리 중인 날짜 기준으로 보존하므로 다음 백필일에도 이전 기사로 인식
+    story = [{'title': '삼성전자, 2분기 영업이익 10조 돌파'}]
+    history = NearDuplicateIndex(state_path=state_path)
+    assert titles(remove_near_duplicates(story, '20250901', history)) == titles(story)
+    history.save(as_of='20250901')
+
+    history = NearDuplicateIndex(state_path=state_path)
+    assert len(history) == 2
+    assert remove_near_duplicates(story, '20250902', history) == []
+    history.save(as_of='20250902')
+
+    # 보존 기간이 지난 백필 기사는 이후 실시간 실행을 막지 않고, 실시간 저장 시 정리됨
+    history = NearDuplicateIndex(state_path=state_path)
+    assert titles(remove_near_duplicates(story, '20251016', history)) == titles(story)
+    history.save(as_of='20251016')
+    assert sorted(NearDuplicateIndex(state_path=state_path).first_seen.values()) == ['20251015', '20251016']